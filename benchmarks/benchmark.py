@@ -0,0 +1,257 @@
+"""End-to-end load benchmark of the Tessie coordinator and platforms.
+
+Drives TessieDataUpdateCoordinator plus every sensor and switch entity
+against the local mock API and reports, per fleet size:
+
+    refresh     latency of a full coordinator refresh (p50 / p95 / max)
+    writes      entity state writes caused by one refresh
+    fan-out     time spent synchronously notifying entities per refresh
+    loop lag    longest the event loop was blocked during the run
+    resp KiB    average size of an API response
+
+Run from the repository root with Home Assistant installed:
+
+    python -m benchmarks.benchmark --fleet 1 10 50 100 500 --refreshes 20
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections.abc import Callable
+from dataclasses import dataclass, field
+import statistics
+import tempfile
+import time
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.entity import Entity
+
+from custom_components.tessie import (
+    TessieDataUpdateCoordinator,
+    get_tracked_key_paths,
+    sensor,
+    switch,
+)
+from custom_components.tessie.const import (
+    ACCESS_TOKEN,
+    CONF_SENSOR_GROUPS,
+    DOMAIN,
+    SENSOR_GROUPS,
+)
+from custom_components.tessie.metrics import CoordinatorMetrics
+from custom_components.tessie.scheduler import VehiclePollScheduler
+
+from .mock_tessie import MockTessieApi
+
+
+@dataclass
+class Result:
+    """Measurements of one fleet size."""
+
+    vehicles: int
+    entities: int = 0
+    refreshes: list[float] = field(default_factory=list)
+    fan_outs: list[float] = field(default_factory=list)
+    writes: list[int] = field(default_factory=list)
+    failed: int = 0
+    max_lag: float = 0.0
+    response_bytes: float = 0.0
+
+    def row(self) -> str:
+        """Format the result as a table row."""
+        refreshes = sorted(self.refreshes) or [0.0]
+        p95 = refreshes[min(len(refreshes) - 1, int(len(refreshes) * 0.95))]
+        return (
+            f"{self.vehicles:>8} {self.entities:>8} "
+            f"{statistics.median(refreshes) * 1000:>9.1f} {p95 * 1000:>9.1f} "
+            f"{refreshes[-1] * 1000:>9.1f} "
+            f"{statistics.fmean(self.writes or [0]):>9.1f} "
+            f"{statistics.fmean(self.fan_outs or [0]) * 1000:>10.2f} "
+            f"{self.max_lag * 1000:>9.1f} {self.failed:>6} "
+            f"{self.response_bytes / 1024:>8.1f}"
+        )
+
+
+HEADER = (
+    f"{'vehicles':>8} {'entities':>8} {'p50 ms':>9} {'p95 ms':>9} {'max ms':>9} "
+    f"{'writes':>9} {'fan-out ms':>10} {'lag ms':>9} {'failed':>6} {'resp KiB':>8}"
+)
+
+
+async def _monitor_loop_lag(result: Result, stop: asyncio.Event) -> None:
+    """Record the longest time the event loop did not get back to us."""
+    loop = asyncio.get_running_loop()
+    interval = 0.001
+    while not stop.is_set():
+        start = loop.time()
+        await asyncio.sleep(interval)
+        result.max_lag = max(result.max_lag, loop.time() - start - interval)
+
+
+async def _async_add_entities(
+    hass: HomeAssistant,
+    coordinator: TessieDataUpdateCoordinator,
+    entry: ConfigEntry,
+    writes: list[int],
+) -> list[Entity]:
+    """Create the sensor and switch entities and subscribe them."""
+    entities: list[Entity] = []
+
+    def _add(new_entities: Any, update_before_add: bool = False) -> None:
+        entities.extend(new_entities)
+
+    await sensor.async_setup_entry(hass, entry, _add)
+    await switch.async_setup_entry(hass, entry, _add)
+
+    for index, entity in enumerate(entities):
+        entity.hass = hass
+        entity.entity_id = f"{DOMAIN}.bench_{index}"
+        entity.async_write_ha_state = _counting_writer(entity, writes)
+        coordinator.async_add_listener(
+            entity._handle_coordinator_update,  # noqa: SLF001
+            entity.coordinator_context,
+        )
+    return entities
+
+
+def _counting_writer(entity: Entity, writes: list[int]) -> Callable[[], None]:
+    """Return a state writer that counts writes and evaluates the state."""
+    read = (
+        (lambda: entity.is_on)
+        if hasattr(entity, "is_on")
+        else (lambda: entity.native_value)
+    )
+
+    def _write() -> None:
+        writes[0] += 1
+        read()
+
+    return _write
+
+
+async def run_fleet(
+    vehicles: int,
+    refreshes: int,
+    latency: float,
+    error_rate: float,
+    concurrent: bool,
+    requests_per_minute: int,
+    sensor_groups: list[str],
+) -> Result:
+    """Benchmark one fleet size."""
+    result = Result(vehicles)
+    api = MockTessieApi(vehicles=vehicles, latency=latency, error_rate=error_rate)
+    await api.start()
+    metrics = CoordinatorMetrics()
+    session = api.session(trace_configs=[metrics.trace_config()])
+
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        await er.async_load(hass)
+        entry = ConfigEntry(
+            version=1,
+            minor_version=1,
+            domain=DOMAIN,
+            title="benchmark",
+            data={ACCESS_TOKEN: "mock"},
+            source="user",
+            options={CONF_SENSOR_GROUPS: {vin: sensor_groups for vin in api.fleet}},
+        )
+        coordinator = TessieDataUpdateCoordinator(
+            hass,
+            session,
+            "mock",
+            entry.entry_id,
+            concurrent_fetch=concurrent,
+            key_paths=get_tracked_key_paths(sensor_groups),
+            requests_per_minute=requests_per_minute,
+            metrics=metrics,
+        )
+        await coordinator.async_refresh()
+        hass.data.setdefault(DOMAIN, {})[entry.entry_id] = coordinator
+
+        writes = [0]
+        entities = await _async_add_entities(hass, coordinator, entry, writes)
+        result.entities = len(entities)
+
+        update_listeners = coordinator.async_update_listeners
+
+        def _timed_update_listeners() -> None:
+            start = time.perf_counter()
+            update_listeners()
+            result.fan_outs.append(time.perf_counter() - start)
+
+        coordinator.async_update_listeners = _timed_update_listeners
+
+        stop = asyncio.Event()
+        monitor = asyncio.create_task(_monitor_loop_lag(result, stop))
+        for _ in range(refreshes):
+            # Make every vehicle due so each round polls the whole fleet
+            coordinator.scheduler = VehiclePollScheduler()
+            writes[0] = 0
+            start = time.perf_counter()
+            await coordinator.async_refresh()
+            result.refreshes.append(time.perf_counter() - start)
+            result.writes.append(writes[0])
+            if not coordinator.last_update_success:
+                result.failed += 1
+        stop.set()
+        await monitor
+        if metrics.responses:
+            result.response_bytes = metrics.payload_bytes / metrics.responses
+
+        await coordinator.async_shutdown()
+        await hass.async_stop(force=True)
+
+    await session.close()
+    await api.stop()
+    return result
+
+
+async def _run(args: argparse.Namespace) -> None:
+    """Run the benchmark for every requested fleet size."""
+    print(HEADER)
+    for vehicles in args.fleet:
+        result = await run_fleet(
+            vehicles,
+            args.refreshes,
+            args.latency,
+            args.error_rate,
+            args.concurrent,
+            args.requests_per_minute,
+            args.sensor_groups,
+        )
+        print(result.row(), flush=True)
+
+
+def main() -> None:
+    """Run the benchmark from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--fleet", type=int, nargs="+", default=[1, 10, 50, 100, 500])
+    parser.add_argument("--refreshes", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument(
+        "--concurrent", action="store_true", help="use the per-vehicle fetch mode"
+    )
+    parser.add_argument(
+        "--requests-per-minute",
+        type=int,
+        default=60000,
+        help="rate limit of the account, high enough by default to never wait",
+    )
+    parser.add_argument(
+        "--sensor-groups",
+        nargs="+",
+        choices=SENSOR_GROUPS,
+        default=list(SENSOR_GROUPS),
+        help="sensor groups created for every vehicle",
+    )
+    asyncio.run(_run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,436 @@
+"""Local stand-in for the Tessie API used by the integration.
+
+Serves the endpoints hit through tessie_api:
+
+    GET /vehicles                 state of every vehicle on the account
+    GET /{vin}/state              state of a single vehicle
+    GET /{vin}/wake               wake a vehicle
+    GET /{vin}/command/{command}  switch and service commands
+    GET /{vin}/charges            past charges of a vehicle
+    GET /{vin}/drives             past drives of a vehicle
+    GET /streaming/{vin}          telemetry websocket of a vehicle
+
+with a configurable fleet size, response latency and error injection. The
+state of charging vehicles drifts on every request while idle vehicles
+mostly return their cached state, as the real API does. Connected
+websockets receive the drifted charge fields every stream_interval seconds.
+Waking an asleep vehicle, explicitly or by sending it a command, takes
+wake_latency seconds.
+
+Run it standalone with ``python -m benchmarks.mock_tessie --vehicles 50``.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections.abc import Callable
+from dataclasses import dataclass, field
+import random
+import time
+from typing import Any
+
+from aiohttp import ClientSession, WSCloseCode, web
+
+TESSIE_URL = "https://api.tessie.com"
+STREAMING_URL = "wss://streaming.tessie.com"
+
+# Effect of each command on the vehicle state: (sub state, field, value)
+COMMANDS: dict[str, tuple[str, str, Any]] = {
+    "start_charging": ("charge_state", "charging_state", "Charging"),
+    "stop_charging": ("charge_state", "charging_state", "Stopped"),
+    "open_charge_port": ("charge_state", "charge_port_door_open", True),
+    "close_charge_port": ("charge_state", "charge_port_door_open", False),
+    "start_climate": ("climate_state", "is_climate_on", True),
+    "stop_climate": ("climate_state", "is_climate_on", False),
+    "start_steering_wheel_heater": ("climate_state", "steering_wheel_heater", True),
+    "stop_steering_wheel_heater": ("climate_state", "steering_wheel_heater", False),
+    "lock": ("vehicle_state", "locked", True),
+    "unlock": ("vehicle_state", "locked", False),
+    "enable_sentry": ("vehicle_state", "sentry_mode", True),
+    "disable_sentry": ("vehicle_state", "sentry_mode", False),
+    "enable_valet": ("vehicle_state", "valet_mode", True),
+    "disable_valet": ("vehicle_state", "valet_mode", False),
+}
+
+
+def make_vehicle(index: int, rng: random.Random) -> dict[str, Any]:
+    """Create a vehicle with every field read by the sensors and switches."""
+    vin = f"5YJ3MOCK{index:09d}"
+    now = int(time.time() * 1000)
+    charging = rng.random() < 0.3
+    return {
+        "vin": vin,
+        "is_active": True,
+        "last_state": {
+            "vin": vin,
+            "display_name": f"Mock Car {index}",
+            "state": "online",
+            "vehicle_config": {"car_type": rng.choice(("model3", "modely"))},
+            "charge_state": {
+                "timestamp": now,
+                "battery_heater_on": False,
+                "battery_level": rng.randint(20, 90),
+                "battery_range": 180.5,
+                "charge_amps": 16,
+                "charge_current_request": 16,
+                "charge_current_request_max": 32,
+                "charge_enable_request": True,
+                "charge_energy_added": 12.5,
+                "charge_limit_soc": 80,
+                "charge_limit_soc_max": 100,
+                "charge_limit_soc_min": 50,
+                "charge_limit_soc_std": 90,
+                "charge_miles_added_ideal": 45.0,
+                "charge_miles_added_rated": 45.0,
+                "charge_port_cold_weather_mode": False,
+                "charge_port_color": "Off",
+                "charge_port_door_open": charging,
+                "charge_port_latch": "Engaged",
+                "charge_rate": 22.4,
+                "charger_actual_current": 16 if charging else 0,
+                "charger_phases": 1,
+                "charger_pilot_current": 32,
+                "charger_power": 11 if charging else 0,
+                "charger_voltage": 240 if charging else 0,
+                "charging_state": "Charging" if charging else "Stopped",
+                "conn_charge_cable": "IEC" if charging else "<invalid>",
+                "est_battery_range": 150.2,
+                "fast_charger_brand": "<invalid>",
+                "fast_charger_present": False,
+                "fast_charger_type": "<invalid>",
+                "ideal_battery_range": 180.5,
+                "max_range_charge_counter": 0,
+                "minutes_to_full_charge": 95 if charging else 0,
+                "not_enough_power_to_heat": None,
+                "off_peak_charging_enabled": False,
+                "off_peak_charging_times": "all_week",
+                "off_peak_hours_end_time": 360,
+                "preconditioning_enabled": False,
+                "preconditioning_times": "all_week",
+                "scheduled_charging_mode": "Off",
+                "scheduled_charging_pending": False,
+                "scheduled_charging_start_time": None,
+                "scheduled_departure_time": 1700000000,
+                "scheduled_departure_time_minutes": 480,
+                "supercharger_session_trip_planner": False,
+                "time_to_full_charge": 1.58 if charging else 0,
+                "trip_charging": False,
+                "usable_battery_level": 60,
+                "user_charge_enable_request": None,
+            },
+            "climate_state": {
+                "timestamp": now,
+                "is_climate_on": False,
+                "steering_wheel_heater": False,
+                "inside_temp": 21.5,
+                "outside_temp": 12.0,
+            },
+            "vehicle_state": {
+                "timestamp": now,
+                "locked": rng.random() < 0.8,
+                "sentry_mode": False,
+                "valet_mode": False,
+                "odometer": 12345.6,
+            },
+            "drive_state": {
+                "timestamp": now,
+                "shift_state": None,
+                "speed": None,
+                "power": 0,
+            },
+            # Large subtrees no entity reads, as in real payloads
+            "gui_settings": {"gui_distance_units": "km/hr", "gui_24_hour_time": True},
+            "vehicle_config_extra": {f"option_{n}": n for n in range(40)},
+        },
+    }
+
+
+@dataclass
+class MockTessieApi:
+    """In-process mock of the Tessie HTTP API."""
+
+    vehicles: int = 1
+    latency: float = 0.0
+    jitter: float = 0.0
+    error_rate: float = 0.0
+    stream_interval: float = 1.0
+    wake_latency: float = 0.0
+    seed: int = 0
+    host: str = "127.0.0.1"
+    port: int = 0
+    requests: int = 0
+    errors: int = 0
+    wakes: int = 0
+    fleet: dict[str, dict[str, Any]] = field(default_factory=dict)
+
+    def __post_init__(self) -> None:
+        """Create the fleet and the web application."""
+        self._rng = random.Random(self.seed)
+        for index in range(self.vehicles):
+            car = make_vehicle(index, self._rng)
+            self.fleet[car["vin"]] = car
+        self._runner: web.AppRunner | None = None
+        self._websockets: set[web.WebSocketResponse] = set()
+        self.stream_messages = 0
+        self.url = ""
+
+    async def start(self) -> str:
+        """Start serving and return the base URL."""
+        app = web.Application()
+        app.router.add_get("/vehicles", self._handle_vehicles)
+        app.router.add_get("/{vin}/state", self._handle_state)
+        app.router.add_get("/{vin}/wake", self._handle_wake)
+        app.router.add_get("/{vin}/command/{command}", self._handle_command)
+        app.router.add_get("/{vin}/charges", self._handle_charges)
+        app.router.add_get("/{vin}/drives", self._handle_drives)
+        app.router.add_get("/streaming/{vin}", self._handle_streaming)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]  # noqa: SLF001
+        self.url = f"http://{self.host}:{port}"
+        return self.url
+
+    async def stop(self) -> None:
+        """Stop serving."""
+        await self.close_streams()
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def close_streams(self) -> None:
+        """Close every connected telemetry websocket."""
+        for websocket in list(self._websockets):
+            await websocket.close(code=WSCloseCode.GOING_AWAY)
+
+    def session(self, **kwargs: Any) -> ClientSession:
+        """Return a client session that sends Tessie requests to the mock."""
+        return RedirectingSession(
+            {TESSIE_URL: self.url, STREAMING_URL: f"{self.url}/streaming"}, **kwargs
+        )
+
+    async def _respond(self) -> None:
+        """Apply the configured latency and error injection."""
+        self.requests += 1
+        delay = self.latency + self._rng.uniform(0, self.jitter)
+        if delay:
+            await asyncio.sleep(delay)
+        if self._rng.random() < self.error_rate:
+            self.errors += 1
+            raise web.HTTPInternalServerError(text="injected error")
+
+    def _drift(self, car: dict[str, Any]) -> None:
+        """Move the state of a vehicle along a little."""
+        state = car["last_state"]
+        now = int(time.time() * 1000)
+        charge = state["charge_state"]
+        if charge["charging_state"] == "Charging":
+            charge["timestamp"] = now
+            charge["battery_level"] = min(charge["battery_level"] + 1, 100)
+            charge["charge_energy_added"] = round(
+                charge["charge_energy_added"] + 0.2, 2
+            )
+            charge["charger_power"] = self._rng.choice((10, 11, 11, 12))
+        elif self._rng.random() < 0.1:
+            charge["timestamp"] = now
+            charge["battery_level"] = max(charge["battery_level"] - 1, 0)
+
+    async def _handle_vehicles(self, request: web.Request) -> web.Response:
+        """Return the state of every vehicle."""
+        await self._respond()
+        for car in self.fleet.values():
+            self._drift(car)
+        return web.json_response({"results": list(self.fleet.values())})
+
+    async def _handle_state(self, request: web.Request) -> web.Response:
+        """Return the state of one vehicle."""
+        await self._respond()
+        if (car := self.fleet.get(request.match_info["vin"])) is None:
+            raise web.HTTPNotFound
+        self._drift(car)
+        return web.json_response(car["last_state"])
+
+    async def _wake(self, car: dict[str, Any]) -> None:
+        """Wake a vehicle if it is asleep."""
+        if car["last_state"]["state"] != "online":
+            self.wakes += 1
+            await asyncio.sleep(self.wake_latency)
+            car["last_state"]["state"] = "online"
+
+    async def _handle_charges(self, request: web.Request) -> web.Response:
+        """Return a charge of one vehicle for every day in the window."""
+        return await self._history(
+            request,
+            lambda started, index: {
+                "energy_added": 10 + index % 5,
+                "starting_battery": 40,
+                "ending_battery": 70,
+            },
+        )
+
+    async def _handle_drives(self, request: web.Request) -> web.Response:
+        """Return a drive of one vehicle for every day in the window."""
+        return await self._history(
+            request,
+            lambda started, index: {
+                "odometer_distance": 20.5 + index % 3,
+                "starting_battery": 70,
+                "ending_battery": 65,
+            },
+        )
+
+    async def _history(
+        self,
+        request: web.Request,
+        make: Callable[[int, int], dict[str, Any]],
+    ) -> web.Response:
+        """Return one record per day that started in the requested window.
+
+        Records take an hour, so the last one may still be in progress.
+        """
+        await self._respond()
+        if request.match_info["vin"] not in self.fleet:
+            raise web.HTTPNotFound
+        start = int(request.query["from"])
+        end = int(request.query["to"])
+        now = int(time.time())
+        results = []
+        for started in range(start - start % 86400 + 43200, end + 1, 86400):
+            if started < start:
+                continue
+            ended = started + 3600
+            results.append(
+                {
+                    "id": started // 86400,
+                    "started_at": started,
+                    "ended_at": ended if ended <= now else None,
+                    **make(started, started // 86400),
+                }
+            )
+        return web.json_response({"results": results})
+
+    async def _handle_wake(self, request: web.Request) -> web.Response:
+        """Wake one vehicle."""
+        await self._respond()
+        if (car := self.fleet.get(request.match_info["vin"])) is None:
+            raise web.HTTPNotFound
+        await self._wake(car)
+        return web.json_response({"result": True})
+
+    async def _handle_streaming(self, request: web.Request) -> web.StreamResponse:
+        """Stream the telemetry of one vehicle until the client disconnects."""
+        await self._respond()
+        if (car := self.fleet.get(request.match_info["vin"])) is None:
+            raise web.HTTPNotFound
+        websocket = web.WebSocketResponse()
+        await websocket.prepare(request)
+        self._websockets.add(websocket)
+        try:
+            while not websocket.closed:
+                self._drift(car)
+                charge = car["last_state"]["charge_state"]
+                await websocket.send_json(
+                    {
+                        "vin": car["vin"],
+                        "createdAt": time.strftime("%Y-%m-%dT%H:%M:%SZ"),
+                        "data": [
+                            {
+                                "key": "BatteryLevel",
+                                "value": {"doubleValue": charge["battery_level"]},
+                            },
+                            {
+                                "key": "ACChargingEnergyIn",
+                                "value": {"doubleValue": charge["charge_energy_added"]},
+                            },
+                            {
+                                "key": "ACChargingPower",
+                                "value": {"doubleValue": charge["charger_power"]},
+                            },
+                            {
+                                "key": "DetailedChargeState",
+                                "value": {
+                                    "detailedChargeStateValue": "DetailedChargeState"
+                                    + charge["charging_state"]
+                                },
+                            },
+                        ],
+                    }
+                )
+                self.stream_messages += 1
+                await asyncio.sleep(self.stream_interval)
+        except ConnectionResetError:
+            pass
+        finally:
+            self._websockets.discard(websocket)
+        return websocket
+
+    async def _handle_command(self, request: web.Request) -> web.Response:
+        """Run a command against one vehicle."""
+        await self._respond()
+        if (car := self.fleet.get(request.match_info["vin"])) is None:
+            raise web.HTTPNotFound
+        await self._wake(car)
+        now = int(time.time() * 1000)
+        if effect := COMMANDS.get(request.match_info["command"]):
+            sub_state, key, value = effect
+            car["last_state"][sub_state][key] = value
+            car["last_state"][sub_state]["timestamp"] = now
+        elif request.match_info["command"] == "set_charging_amps":
+            charge = car["last_state"]["charge_state"]
+            charge["charge_amps"] = int(request.query["amps"])
+            charge["charge_current_request"] = int(request.query["amps"])
+            charge["timestamp"] = now
+        return web.json_response({"result": True, "woke": False})
+
+
+class RedirectingSession(ClientSession):
+    """Client session that rewrites requests for some base URLs to others."""
+
+    def __init__(self, redirects: dict[str, str], **kwargs: Any) -> None:
+        """Initialize the session."""
+        super().__init__(**kwargs)
+        self._redirects = redirects
+
+    def _request(self, method: str, str_or_url: Any, **kwargs: Any) -> Any:
+        """Rewrite the URL before sending the request."""
+        url = str(str_or_url)
+        for source, target in self._redirects.items():
+            if url.startswith(source):
+                url = target + url[len(source) :]
+                break
+        return super()._request(method, url, **kwargs)
+
+
+async def _serve(args: argparse.Namespace) -> None:
+    """Serve the mock API until interrupted."""
+    api = MockTessieApi(
+        vehicles=args.vehicles,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        port=args.port,
+    )
+    print(f"Serving {args.vehicles} vehicle(s) on {await api.start()}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await api.stop()
+
+
+def main() -> None:
+    """Run the mock API from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--vehicles", type=int, default=1)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--port", type=int, default=8080)
+    try:
+        asyncio.run(_serve(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -1,92 +1,211 @@
 """The tessie integration."""
 from __future__ import annotations
 
-from asyncio import timeout
+from collections.abc import Iterable
 from datetime import timedelta
 import logging
 from typing import Any
 
-from aiohttp import ClientError, ClientResponseError, ClientSession
-from tessie_api import get_state_of_all_vehicles
+from aiohttp import ClientSession, TCPConnector
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
-from homeassistant.helpers.device_registry import DeviceEntryType, DeviceInfo
-from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.helpers.storage import Store
+from homeassistant.util.ssl import get_default_context
+
+from .const import (
+    ACCESS_TOKEN,
+    CONF_CONCURRENT_FETCH,
+    CONF_HISTORY,
+    CONF_MAX_CONCURRENCY,
+    CONF_MAX_STALE_AGE,
+    CONF_REQUESTS_PER_MINUTE,
+    CONF_SENSOR_GROUPS,
+    CONF_SOLAR_DWELL,
+    CONF_SOLAR_ENTITIES,
+    CONF_SOLAR_HYSTERESIS,
+    CONF_SOLAR_STEP,
+    CONF_STREAMING,
+    CONF_VEHICLE_TIMEOUT,
+    DEFAULT_CONCURRENT_FETCH,
+    DEFAULT_HISTORY,
+    DEFAULT_MAX_CONCURRENCY,
+    DEFAULT_MAX_STALE_AGE,
+    DEFAULT_REQUESTS_PER_MINUTE,
+    DEFAULT_SOLAR_DWELL,
+    DEFAULT_SOLAR_HYSTERESIS,
+    DEFAULT_SOLAR_STEP,
+    DEFAULT_STREAMING,
+    DEFAULT_VEHICLE_TIMEOUT,
+    DOMAIN,
+    SENSOR_GROUPS,
+    STORAGE_VERSION,
+)
+from .coordinator import TessieDataUpdateCoordinator
+from .helpers import KeyPath, compile_key_path
+from .metrics import CoordinatorMetrics
+from .normalize import Normalizer
+from .sensor import SENSOR_INFO_TYPES_TESLA, get_normalizer
+from .services import VehicleDeviceIndex, async_setup_services, async_unload_services
+from .solar import SolarChargeController
+from .switch import SWITCH_TYPES
 
-from .const import ACCESS_TOKEN, DOMAIN, MANUFACTURER, NAME
-from .services import async_setup_services
+_LOGGER = logging.getLogger(__name__)
 
 PLATFORMS: list[Platform] = [Platform.SENSOR, Platform.SWITCH]
 
-_LOGGER = logging.getLogger(__name__)
+
+def get_tracked_key_paths(groups: Iterable[str] = SENSOR_GROUPS) -> list[KeyPath]:
+    """Return the key paths read by the switches and the sensors of groups."""
+    return [
+        compile_key_path(key)
+        for key in (
+            *(
+                description.key
+                for description in SENSOR_INFO_TYPES_TESLA
+                if description.group in groups
+            ),
+            *(switch_type.key for switch_type in SWITCH_TYPES),
+        )
+    ]
+
+
+def get_normalizers() -> dict[KeyPath, Normalizer]:
+    """Return the normalizer of every vehicle sensor that has one."""
+    return {
+        compile_key_path(description.key): normalizer
+        for description in SENSOR_INFO_TYPES_TESLA
+        if (normalizer := get_normalizer(description)) is not None
+    }
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up SEMS Portal from a config entry."""
 
-    async_setup_services(hass, entry)
+    async_setup_services(hass)
 
+    # Every account gets its own connection pool so one slow account does
+    # not hold up the requests of the others. Sessions from the aiohttp
+    # helper share the connector of Home Assistant and cannot be closed, so
+    # the entry owns a plain session and closes it on unload.
     accessToken: str = entry.data[ACCESS_TOKEN]
-    websession = async_get_clientsession(hass)
-
-    coordinator = TessieDataUpdateCoordinator(hass, websession, accessToken)
-    await coordinator.async_config_entry_first_refresh()
+    metrics = CoordinatorMetrics()
+    websession = ClientSession(
+        connector=TCPConnector(ssl=get_default_context()),
+        trace_configs=[metrics.trace_config()],
+    )
+    entry.async_on_unload(websession.close)
+
+    store: Store[dict[str, Any]] = Store(
+        hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}"
+    )
+    coordinator = TessieDataUpdateCoordinator(
+        hass,
+        websession,
+        accessToken,
+        entry.entry_id,
+        store=store,
+        metrics=metrics,
+        key_paths=get_tracked_key_paths(),
+        vehicle_key_paths={
+            vin: get_tracked_key_paths(groups)
+            for vin, groups in entry.options.get(CONF_SENSOR_GROUPS, {}).items()
+        },
+        normalizers=get_normalizers(),
+        max_stale_age=timedelta(
+            minutes=entry.options.get(CONF_MAX_STALE_AGE, DEFAULT_MAX_STALE_AGE)
+        ),
+        requests_per_minute=entry.options.get(
+            CONF_REQUESTS_PER_MINUTE, DEFAULT_REQUESTS_PER_MINUTE
+        ),
+        concurrent_fetch=entry.options.get(
+            CONF_CONCURRENT_FETCH, DEFAULT_CONCURRENT_FETCH
+        ),
+        max_concurrency=entry.options.get(
+            CONF_MAX_CONCURRENCY, DEFAULT_MAX_CONCURRENCY
+        ),
+        vehicle_timeout=entry.options.get(
+            CONF_VEHICLE_TIMEOUT, DEFAULT_VEHICLE_TIMEOUT
+        ),
+    )
+    # Create the entities from the last known snapshot when there is one and
+    # let the live refresh catch up in the background.
+    if (snapshot := await store.async_load()) is not None:
+        coordinator.async_restore_snapshot(snapshot)
+    else:
+        await coordinator.async_config_entry_first_refresh()
 
     hass.data.setdefault(DOMAIN, {})[entry.entry_id] = coordinator
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
+    if snapshot is not None:
+        entry.async_create_background_task(
+            hass, coordinator.async_refresh(), f"{DOMAIN} refresh {entry.entry_id}"
+        )
+
+    coordinator.device_index = VehicleDeviceIndex.from_vehicles(hass, coordinator.data)
+    entry.async_on_unload(coordinator.device_index.async_setup())
+
+    if entry.options.get(CONF_STREAMING, DEFAULT_STREAMING):
+        coordinator.async_start_streaming(entry)
+
+    for vin, entity_id in entry.options.get(CONF_SOLAR_ENTITIES, {}).items():
+        if not entity_id or vin not in coordinator.data:
+            continue
+        controller = coordinator.solar_controllers[vin] = SolarChargeController(
+            coordinator,
+            vin,
+            entity_id,
+            hysteresis=entry.options.get(
+                CONF_SOLAR_HYSTERESIS, DEFAULT_SOLAR_HYSTERESIS
+            ),
+            dwell=entry.options.get(CONF_SOLAR_DWELL, DEFAULT_SOLAR_DWELL),
+            step=entry.options.get(CONF_SOLAR_STEP, DEFAULT_SOLAR_STEP),
+        )
+        entry.async_on_unload(controller.async_setup())
+
+    if entry.options.get(CONF_HISTORY, DEFAULT_HISTORY):
+        if "recorder" in hass.config.components:
+            # Only imported when enabled, as it pulls in the recorder
+            # pylint: disable-next=import-outside-toplevel
+            from .history import HistoryImporter
+
+            coordinator.history_importer = HistoryImporter(
+                coordinator,
+                Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}.history"),
+            )
+            entry.async_create_background_task(
+                hass,
+                coordinator.history_importer.async_run(),
+                f"{DOMAIN} history {entry.entry_id}",
+            )
+        else:
+            _LOGGER.warning("Importing the vehicle history requires the recorder")
+
+    entry.async_on_unload(entry.add_update_listener(async_reload_entry))
+
     return True
 
 
+async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Reload the config entry when its options change."""
+    await hass.config_entries.async_reload(entry.entry_id)
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
         hass.data[DOMAIN].pop(entry.entry_id)
+        async_unload_services(hass)
 
     return unload_ok
 
 
-class TessieDataUpdateCoordinator(DataUpdateCoordinator[dict[str, Any]]):
-    """Class to manage fetching AccuWeather data API."""
-
-    def __init__(
-        self,
-        hass: HomeAssistant,
-        session: ClientSession,
-        token: str,
-    ) -> None:
-        """Initialize."""
-        self.session = session
-        self.token = token
-        self.device_info = DeviceInfo(
-            entry_type=DeviceEntryType.SERVICE,
-            identifiers={(DOMAIN, MANUFACTURER)},
-            manufacturer=MANUFACTURER,
-            name=NAME,
-            configuration_url=("https://tessie.com"),
-        )
-
-        update_interval = timedelta(minutes=5)
-        _LOGGER.debug("Data will be update every %s", update_interval)
-
-        super().__init__(hass, _LOGGER, name=DOMAIN, update_interval=update_interval)
-
-    async def _async_update_data(self) -> dict[str, Any]:
-        """Update data via library."""
-        try:
-            async with timeout(10):
-                active_vehicles = await get_state_of_all_vehicles(
-                    self.session, self.token, True
-                )
-        except (
-            ClientResponseError,
-            ClientError,
-            Exception,
-        ) as error:
-            raise UpdateFailed(error) from error
-
-        return active_vehicles
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the persisted snapshot and history cursors of a removed entry."""
+    await Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}").async_remove()
+    await Store(
+        hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}.history"
+    ).async_remove()
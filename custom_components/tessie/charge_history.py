@@ -0,0 +1,127 @@
+"""Recent charge metrics of each vehicle and the statistics derived from them."""
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_left
+from itertools import pairwise
+from math import fsum
+
+from .helpers import compile_key_path
+from .models import VehicleState
+from .scheduler import CHARGING_STATE
+
+CHARGER_POWER = compile_key_path("last_state.charge_state.charger_power")
+CHARGER_CURRENT = compile_key_path("last_state.charge_state.charger_actual_current")
+
+# Key paths the charge history is sampled from, kept in every vehicle record
+CHARGE_HISTORY_KEY_PATHS = (CHARGING_STATE, CHARGER_POWER, CHARGER_CURRENT)
+
+# Context of the entities derived from the charge history of a vehicle
+CHARGE_HISTORY = compile_key_path("charge_history")
+
+
+class ChargeHistory:
+    """Fixed-size ring buffer of the charge samples of one vehicle.
+
+    Each metric lives in its own array so statistics run over contiguous
+    numbers. The energy and peak current of the current charging session are
+    accumulated as samples arrive, so they survive the buffer wrapping.
+    """
+
+    __slots__ = (
+        "size",
+        "count",
+        "_next",
+        "times",
+        "power",
+        "current",
+        "charging",
+        "session_energy",
+        "peak_current",
+    )
+
+    def __init__(self, size: int) -> None:
+        """Initialize an empty buffer holding up to size samples."""
+        self.size = size
+        self.count = 0
+        self._next = 0
+        self.times = array("d", bytes(8 * size))
+        self.power = array("f", bytes(4 * size))
+        self.current = array("f", bytes(4 * size))
+        self.charging = False
+        self.session_energy: float | None = None
+        self.peak_current: float | None = None
+
+    def record(self, now: float, car: VehicleState) -> bool:
+        """Add a sample taken from a vehicle at now and return if it was added."""
+        power = car.get(CHARGER_POWER)
+        if power is None or (self.count and now <= self._last(self.times)):
+            return False
+        current = car.get(CHARGER_CURRENT) or 0
+        charging = car.get(CHARGING_STATE) == "Charging"
+
+        if charging and not self.charging:
+            self.session_energy = 0.0
+            self.peak_current = float(current)
+        elif charging and self.count:
+            hours = (now - self._last(self.times)) / 3600
+            self.session_energy += (power + self._last(self.power)) / 2 * hours
+            self.peak_current = max(self.peak_current, current)
+        self.charging = charging
+
+        index = self._next
+        self.times[index] = now
+        self.power[index] = power
+        self.current[index] = current
+        self._next = (index + 1) % self.size
+        self.count = min(self.count + 1, self.size)
+        return True
+
+    @property
+    def latest(self) -> float:
+        """Return when the newest sample was taken, or 0 without samples."""
+        return self._last(self.times) if self.count else 0.0
+
+    def _last(self, values: array) -> float:
+        """Return the newest sample of a metric."""
+        return values[self._next - 1]
+
+    def _ordered(self, values: array) -> array:
+        """Return the samples of a metric from oldest to newest."""
+        if self.count < self.size:
+            return values[: self.count]
+        return values[self._next :] + values[: self._next]
+
+    def average_power(self, now: float, window: float) -> float | None:
+        """Return the time weighted average power over the last window seconds.
+
+        Power is interpolated between samples and the newest sample is held
+        until now.
+        """
+        if not self.count:
+            return None
+        times = self._ordered(self.times)
+        power = self._ordered(self.power)
+        start = now - window
+        first = bisect_left(times, start)
+        if first == len(times):
+            return float(power[-1])
+        # The sample before the window still applies at its start
+        first = max(first - 1, 0)
+        times = times[first:]
+        power = power[first:]
+        if times[0] < start:
+            # Interpolate the power at the start of the window
+            t0, t1 = times[0], times[1]
+            power[0] += (power[1] - power[0]) * (start - t0) / (t1 - t0)
+            times[0] = start
+        times.append(max(now, times[-1]))
+        power.append(power[-1])
+        duration = times[-1] - times[0]
+        if duration <= 0:
+            return float(power[-1])
+        energy = fsum(
+            (p0 + p1) / 2 * (t1 - t0)
+            for (t0, t1), (p0, p1) in zip(pairwise(times), pairwise(power))
+        )
+        return energy / duration
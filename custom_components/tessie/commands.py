@@ -0,0 +1,117 @@
+"""Per vehicle command queue for Tessie switches."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from enum import StrEnum
+import logging
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+
+from .const import COMMAND_DEBOUNCE
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class CommandOutcome(StrEnum):
+    """Final outcome of a queued command."""
+
+    EXECUTED = "executed"
+    CANCELLED = "cancelled"
+
+
+@dataclass
+class _PendingCommand:
+    """A command waiting for the debounce window to pass."""
+
+    value: Any
+    baseline: Any
+    call: Callable[[], Awaitable[Any]]
+    waiters: list[asyncio.Future[CommandOutcome]] = field(default_factory=list)
+
+
+class VehicleCommandQueue:
+    """Serialize, coalesce and debounce the commands sent to one vehicle.
+
+    Commands are keyed by the state they change. A command for a target that
+    already has one pending replaces it, and a command that brings the target
+    back to the value it had before the pending one drops both, so on/off
+    pairs inside the debounce window never reach the API.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, vin: str, debounce: float = COMMAND_DEBOUNCE
+    ) -> None:
+        """Initialize the queue."""
+        self._hass = hass
+        self._vin = vin
+        self._debounce = debounce
+        self._pending: dict[str, _PendingCommand] = {}
+        self._worker: asyncio.Task[None] | None = None
+
+    async def async_submit(
+        self,
+        target: str,
+        value: Any,
+        baseline: Any,
+        call: Callable[[], Awaitable[Any]],
+    ) -> CommandOutcome:
+        """Queue a command setting target to value and wait for its outcome."""
+        waiter: asyncio.Future[CommandOutcome] = self._hass.loop.create_future()
+        pending = self._pending.get(target)
+
+        if pending is None:
+            self._pending[target] = pending = _PendingCommand(value, baseline, call)
+        elif value == pending.baseline:
+            del self._pending[target]
+            _LOGGER.debug(
+                "Commands for %s on %s cancelled each other out", target, self._vin
+            )
+            for cancelled in pending.waiters:
+                cancelled.set_result(CommandOutcome.CANCELLED)
+            return CommandOutcome.CANCELLED
+        else:
+            pending.value = value
+            pending.call = call
+
+        pending.waiters.append(waiter)
+        if self._worker is None:
+            self._worker = self._hass.async_create_task(
+                self._async_process(), f"tessie command queue {self._vin}"
+            )
+        return await waiter
+
+    async def _async_process(self) -> None:
+        """Send the queued commands one at a time once they settled."""
+        try:
+            while self._pending:
+                await asyncio.sleep(self._debounce)
+                while self._pending:
+                    target = next(iter(self._pending))
+                    pending = self._pending.pop(target)
+                    await self._async_execute(target, pending)
+        finally:
+            self._worker = None
+
+    async def _async_execute(self, target: str, pending: _PendingCommand) -> None:
+        """Send a single command and report its outcome to every waiter."""
+        try:
+            await pending.call()
+        except Exception as err:  # pylint: disable=broad-except
+            _LOGGER.debug("Command for %s on %s failed: %s", target, self._vin, err)
+            for waiter in pending.waiters:
+                if not waiter.done():
+                    waiter.set_exception(err)
+            return
+
+        _LOGGER.debug(
+            "Sent command for %s on %s, coalesced %s request(s)",
+            target,
+            self._vin,
+            len(pending.waiters),
+        )
+        for waiter in pending.waiters:
+            if not waiter.done():
+                waiter.set_result(CommandOutcome.EXECUTED)
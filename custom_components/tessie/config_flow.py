@@ -9,11 +9,51 @@ from tessie_api import get_state_of_all_vehicles
 import voluptuous as vol
 
 from homeassistant import config_entries
+from homeassistant.components.sensor import (
+    DOMAIN as SENSOR_DOMAIN,
+    SensorDeviceClass,
+)
+from homeassistant.core import callback
 from homeassistant.data_entry_flow import FlowResult
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.selector import (
+    EntitySelector,
+    EntitySelectorConfig,
+    SelectSelector,
+    SelectSelectorConfig,
+    SelectSelectorMode,
+)
 
-from .const import ACCESS_TOKEN, DOMAIN
+from .const import (
+    ACCESS_TOKEN,
+    CONF_CONCURRENT_FETCH,
+    CONF_HISTORY,
+    CONF_MAX_CONCURRENCY,
+    CONF_MAX_STALE_AGE,
+    CONF_REQUESTS_PER_MINUTE,
+    CONF_SENSOR_GROUPS,
+    CONF_SOLAR_DWELL,
+    CONF_SOLAR_ENTITIES,
+    CONF_SOLAR_HYSTERESIS,
+    CONF_SOLAR_STEP,
+    CONF_STREAMING,
+    CONF_VEHICLE_TIMEOUT,
+    DEFAULT_CONCURRENT_FETCH,
+    DEFAULT_HISTORY,
+    DEFAULT_MAX_CONCURRENCY,
+    DEFAULT_MAX_STALE_AGE,
+    DEFAULT_REQUESTS_PER_MINUTE,
+    DEFAULT_SOLAR_DWELL,
+    DEFAULT_SOLAR_HYSTERESIS,
+    DEFAULT_SOLAR_STEP,
+    DEFAULT_STREAMING,
+    DEFAULT_VEHICLE_TIMEOUT,
+    DOMAIN,
+    SENSOR_GROUPS,
+)
+from .helpers import get_sensor_groups
+from .models import DISPLAY_NAME
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -38,6 +78,14 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
     VERSION = 1
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: config_entries.ConfigEntry,
+    ) -> OptionsFlowHandler:
+        """Get the options flow for this handler."""
+        return OptionsFlowHandler(config_entry)
+
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
@@ -69,6 +117,171 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         )
 
 
+class OptionsFlowHandler(config_entries.OptionsFlow):
+    """Handle the Tessie options."""
+
+    def __init__(self, config_entry: config_entries.ConfigEntry) -> None:
+        """Initialize the options flow."""
+        self.config_entry = config_entry
+        self._options: dict[str, Any] = {}
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Manage the polling options."""
+        if user_input is not None:
+            self._options = user_input
+            return await self.async_step_sensors()
+
+        options = self.config_entry.options
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(
+                        CONF_CONCURRENT_FETCH,
+                        default=options.get(
+                            CONF_CONCURRENT_FETCH, DEFAULT_CONCURRENT_FETCH
+                        ),
+                    ): bool,
+                    vol.Required(
+                        CONF_MAX_CONCURRENCY,
+                        default=options.get(
+                            CONF_MAX_CONCURRENCY, DEFAULT_MAX_CONCURRENCY
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1, max=32)),
+                    vol.Required(
+                        CONF_VEHICLE_TIMEOUT,
+                        default=options.get(
+                            CONF_VEHICLE_TIMEOUT, DEFAULT_VEHICLE_TIMEOUT
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1, max=60)),
+                    vol.Required(
+                        CONF_MAX_STALE_AGE,
+                        default=options.get(CONF_MAX_STALE_AGE, DEFAULT_MAX_STALE_AGE),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0, max=1440)),
+                    vol.Required(
+                        CONF_REQUESTS_PER_MINUTE,
+                        default=options.get(
+                            CONF_REQUESTS_PER_MINUTE, DEFAULT_REQUESTS_PER_MINUTE
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1, max=600)),
+                    vol.Required(
+                        CONF_STREAMING,
+                        default=options.get(CONF_STREAMING, DEFAULT_STREAMING),
+                    ): bool,
+                    vol.Required(
+                        CONF_HISTORY,
+                        default=options.get(CONF_HISTORY, DEFAULT_HISTORY),
+                    ): bool,
+                }
+            ),
+        )
+
+    async def async_step_sensors(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Pick the sensor groups created for each vehicle."""
+        sensor_groups = self.config_entry.options.get(CONF_SENSOR_GROUPS, {})
+        if user_input is not None:
+            self._options[CONF_SENSOR_GROUPS] = sensor_groups | user_input
+            return await self.async_step_solar()
+
+        # The vehicles are only known while the entry is loaded
+        coordinator = self.hass.data.get(DOMAIN, {}).get(self.config_entry.entry_id)
+        if coordinator is None or not coordinator.data:
+            return self.async_create_entry(
+                title="", data={**self.config_entry.options, **self._options}
+            )
+
+        selector = SelectSelector(
+            SelectSelectorConfig(
+                options=list(SENSOR_GROUPS),
+                multiple=True,
+                mode=SelectSelectorMode.LIST,
+                translation_key=CONF_SENSOR_GROUPS,
+            )
+        )
+        return self.async_show_form(
+            step_id="sensors",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(
+                        vin, default=get_sensor_groups(self.config_entry.options, vin)
+                    ): selector
+                    for vin in coordinator.data
+                }
+            ),
+            description_placeholders={
+                "vehicles": "\n".join(
+                    f"{vin}: {car.get(DISPLAY_NAME)}"
+                    for vin, car in coordinator.data.items()
+                )
+            },
+        )
+
+    async def async_step_solar(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Pick the entity each vehicle follows when charging from solar."""
+        options = self.config_entry.options
+        solar_entities = options.get(CONF_SOLAR_ENTITIES, {})
+        coordinator = self.hass.data[DOMAIN][self.config_entry.entry_id]
+        if user_input is not None:
+            return self.async_create_entry(
+                title="",
+                data={
+                    **self._options,
+                    CONF_SOLAR_ENTITIES: solar_entities
+                    | {vin: user_input.get(vin) for vin in coordinator.data},
+                    CONF_SOLAR_HYSTERESIS: user_input[CONF_SOLAR_HYSTERESIS],
+                    CONF_SOLAR_DWELL: user_input[CONF_SOLAR_DWELL],
+                    CONF_SOLAR_STEP: user_input[CONF_SOLAR_STEP],
+                },
+            )
+
+        selector = EntitySelector(
+            EntitySelectorConfig(
+                domain=SENSOR_DOMAIN,
+                device_class=[SensorDeviceClass.POWER, SensorDeviceClass.CURRENT],
+            )
+        )
+        return self.async_show_form(
+            step_id="solar",
+            data_schema=vol.Schema(
+                {
+                    **{
+                        vol.Optional(
+                            vin,
+                            description={"suggested_value": solar_entities.get(vin)},
+                        ): selector
+                        for vin in coordinator.data
+                    },
+                    vol.Required(
+                        CONF_SOLAR_HYSTERESIS,
+                        default=options.get(
+                            CONF_SOLAR_HYSTERESIS, DEFAULT_SOLAR_HYSTERESIS
+                        ),
+                    ): vol.All(vol.Coerce(float), vol.Range(min=0, max=16)),
+                    vol.Required(
+                        CONF_SOLAR_DWELL,
+                        default=options.get(CONF_SOLAR_DWELL, DEFAULT_SOLAR_DWELL),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=10, max=3600)),
+                    vol.Required(
+                        CONF_SOLAR_STEP,
+                        default=options.get(CONF_SOLAR_STEP, DEFAULT_SOLAR_STEP),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1, max=16)),
+                }
+            ),
+            description_placeholders={
+                "vehicles": "\n".join(
+                    f"{vin}: {car.get(DISPLAY_NAME)}"
+                    for vin, car in coordinator.data.items()
+                )
+            },
+        )
+
+
 class CannotConnect(HomeAssistantError):
     """Error to indicate we cannot connect."""
 
@@ -1,6 +1,103 @@
 """Constants for the tessie integration."""
 
+from datetime import timedelta
+
 DOMAIN = "tessie"
 ACCESS_TOKEN = "access_token"
+CONF_CONCURRENT_FETCH = "concurrent_fetch"
+CONF_MAX_CONCURRENCY = "max_concurrency"
+CONF_VEHICLE_TIMEOUT = "vehicle_timeout"
+CONF_MAX_STALE_AGE = "max_stale_age"
+CONF_REQUESTS_PER_MINUTE = "requests_per_minute"
+CONF_STREAMING = "streaming"
+CONF_SENSOR_GROUPS = "sensor_groups"
+CONF_SOLAR_ENTITIES = "solar_entities"
+CONF_SOLAR_HYSTERESIS = "solar_hysteresis"
+CONF_SOLAR_DWELL = "solar_dwell"
+CONF_SOLAR_STEP = "solar_step"
+CONF_HISTORY = "history"
 MANUFACTURER = "Tessie"
 NAME = "Tessie"
+
+# Per vehicle polling intervals, picked from the state of each car
+POLL_INTERVAL_ACTIVE = timedelta(minutes=1)
+POLL_INTERVAL_DEFAULT = timedelta(minutes=5)
+POLL_INTERVAL_PARKED = timedelta(minutes=15)
+POLL_INTERVAL_ASLEEP = timedelta(minutes=30)
+POLL_INTERVAL_ASLEEP_MAX = timedelta(hours=4)
+POLL_INTERVAL_MIN = timedelta(seconds=30)
+
+# Defaults for the per vehicle fetch options
+DEFAULT_CONCURRENT_FETCH = False
+DEFAULT_MAX_CONCURRENCY = 4
+DEFAULT_VEHICLE_TIMEOUT = 10
+
+# Minutes the last good data is served while refreshes keep failing
+DEFAULT_MAX_STALE_AGE = 60
+
+# Rate limit shared by every request of an account
+DEFAULT_REQUESTS_PER_MINUTE = 60
+DEFAULT_REQUEST_BURST = 10
+
+# Streaming telemetry, with polling reduced to a slow reconciliation pass
+DEFAULT_STREAMING = False
+POLL_INTERVAL_STREAMING = timedelta(minutes=30)
+STREAM_HEARTBEAT = 30
+STREAM_RECONNECT_DELAY = 5.0
+STREAM_RECONNECT_DELAY_MAX = 300.0
+
+# Groups of vehicle sensors that can be picked per vehicle, all by default
+SENSOR_GROUP_CORE = "core"
+SENSOR_GROUP_CHARGING = "charging"
+SENSOR_GROUP_SCHEDULING = "scheduling"
+SENSOR_GROUP_DIAGNOSTICS = "diagnostics"
+SENSOR_GROUPS = (
+    SENSOR_GROUP_CORE,
+    SENSOR_GROUP_CHARGING,
+    SENSOR_GROUP_SCHEDULING,
+    SENSOR_GROUP_DIAGNOSTICS,
+)
+
+# Seconds a single request to the API may take, and waking a vehicle
+REQUEST_TIMEOUT = 10
+WAKE_TIMEOUT = 90
+
+# Retries of a failed refresh, and the circuit breaker around them
+RETRY_ATTEMPTS = 3
+RETRY_BASE_DELAY = 1.0
+RETRY_MAX_DELAY = 10.0
+BREAKER_FAILURE_THRESHOLD = 3
+BREAKER_RESET_TIMEOUT = timedelta(minutes=5)
+
+# Vehicles a service call sends its command to at the same time
+SERVICE_MAX_CONCURRENCY = 8
+
+# Seconds to wait for switch commands to settle before sending them
+COMMAND_DEBOUNCE = 1.0
+
+# Seconds after the last command to a vehicle before it is polled on its own
+VEHICLE_REFRESH_DELAY = 5.0
+
+# How long an optimistic value is shown when no poll confirms it
+OPTIMISTIC_TTL = timedelta(minutes=20)
+
+# Persisted snapshot used to create the entities on startup
+STORAGE_VERSION = 1
+SNAPSHOT_SAVE_DELAY = 60
+
+# Amps the available current must move, seconds between commands and the
+# amps the charge current is rounded to when following a solar entity
+DEFAULT_SOLAR_HYSTERESIS = 1.0
+DEFAULT_SOLAR_DWELL = 60
+DEFAULT_SOLAR_STEP = 1
+
+# Charge samples kept per vehicle, and the window of the average charger power
+CHARGE_HISTORY_SIZE = 360
+CHARGE_AVERAGE_WINDOW = timedelta(minutes=15)
+
+# Import of past charges and drives into long-term statistics
+DEFAULT_HISTORY = False
+HISTORY_BACKFILL = timedelta(days=90)
+HISTORY_PAGE = timedelta(days=7)
+HISTORY_PAGE_DELAY = 2.0
+HISTORY_INTERVAL = timedelta(hours=1)
@@ -0,0 +1,758 @@
+"""Data update coordinator for the Tessie integration."""
+from __future__ import annotations
+
+import asyncio
+from asyncio import timeout
+from collections.abc import Awaitable, Callable, Iterable, Mapping
+from datetime import datetime, timedelta
+from functools import partial
+import logging
+from time import monotonic, time
+from typing import TYPE_CHECKING, Any, TypeVar
+
+from aiohttp import ClientError, ClientResponseError, ClientSession
+from tessie_api import get_state, get_state_of_all_vehicles, wake
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.debounce import Debouncer
+from homeassistant.helpers.device_registry import DeviceEntryType, DeviceInfo
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.storage import Store
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
+
+from .charge_history import CHARGE_HISTORY, CHARGE_HISTORY_KEY_PATHS, ChargeHistory
+from .commands import CommandOutcome, VehicleCommandQueue
+from .const import (
+    BREAKER_FAILURE_THRESHOLD,
+    BREAKER_RESET_TIMEOUT,
+    CHARGE_HISTORY_SIZE,
+    DEFAULT_CONCURRENT_FETCH,
+    DEFAULT_MAX_CONCURRENCY,
+    DEFAULT_MAX_STALE_AGE,
+    DEFAULT_REQUEST_BURST,
+    DEFAULT_REQUESTS_PER_MINUTE,
+    DEFAULT_VEHICLE_TIMEOUT,
+    DOMAIN,
+    MANUFACTURER,
+    NAME,
+    OPTIMISTIC_TTL,
+    POLL_INTERVAL_DEFAULT,
+    POLL_INTERVAL_STREAMING,
+    REQUEST_TIMEOUT,
+    RETRY_ATTEMPTS,
+    RETRY_BASE_DELAY,
+    RETRY_MAX_DELAY,
+    SNAPSHOT_SAVE_DELAY,
+    VEHICLE_REFRESH_DELAY,
+    WAKE_TIMEOUT,
+)
+from .governor import RequestGovernor, RequestPriority
+from .helpers import ACCOUNT_CONTEXT, KeyPath, VehicleContext
+from .metrics import CoordinatorMetrics
+from .models import CAR_TYPE, DISPLAY_NAME, TIMESTAMPS, VehicleSchema, VehicleState
+from .normalize import Normalizer
+from .overlay import OptimisticOverlay
+from .resilience import CircuitBreaker, async_retry
+from .scheduler import (
+    CHARGING_STATE,
+    SCHEDULER_KEY_PATHS,
+    SLEEPING_STATES,
+    VEHICLE_STATE,
+    VehiclePollScheduler,
+)
+from .services import VehicleDeviceIndex
+from .solar import SOLAR_KEY_PATHS, SolarChargeController
+from .streaming import VehicleStream
+from .wake import VehicleWakeManager
+
+if TYPE_CHECKING:
+    from .history import HistoryImporter
+
+_LOGGER = logging.getLogger(__name__)
+
+_T = TypeVar("_T")
+
+
+class TessieDataUpdateCoordinator(DataUpdateCoordinator[dict[str, VehicleState]]):
+    """Poll the vehicles of a Tessie account and notify the entities that changed.
+
+    Each vehicle is polled on its own schedule and kept as a compact record
+    of the key paths its entities read. Entities subscribe with a
+    (vin, key path) context, so a refresh, stream update or command only
+    wakes the entities whose value changed. Every request of the account
+    goes through async_api_call and its rate limiting governor.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        session: ClientSession,
+        token: str,
+        entry_id: str,
+        concurrent_fetch: bool = DEFAULT_CONCURRENT_FETCH,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        vehicle_timeout: float = DEFAULT_VEHICLE_TIMEOUT,
+        store: Store[dict[str, Any]] | None = None,
+        key_paths: Iterable[KeyPath] = (),
+        vehicle_key_paths: Mapping[str, Iterable[KeyPath]] | None = None,
+        normalizers: Mapping[KeyPath, Normalizer] | None = None,
+        max_stale_age: timedelta = timedelta(minutes=DEFAULT_MAX_STALE_AGE),
+        requests_per_minute: int = DEFAULT_REQUESTS_PER_MINUTE,
+        metrics: CoordinatorMetrics | None = None,
+    ) -> None:
+        """Initialize."""
+        self.session = session
+        self.token = token
+        self.store = store
+        self.concurrent_fetch = concurrent_fetch
+        self.max_concurrency = max_concurrency
+        self.vehicle_timeout = vehicle_timeout
+        self.max_stale_age = max_stale_age
+        self.device_info = DeviceInfo(
+            entry_type=DeviceEntryType.SERVICE,
+            identifiers={(DOMAIN, entry_id)},
+            manufacturer=MANUFACTURER,
+            name=NAME,
+            configuration_url=("https://tessie.com"),
+        )
+
+        self._changed_contexts: set[VehicleContext] | None = None
+        self.scheduler = VehiclePollScheduler()
+        self._command_queues: dict[str, VehicleCommandQueue] = {}
+        self.wake_managers: dict[str, VehicleWakeManager] = {}
+        self._vehicle_refreshers: dict[str, Debouncer] = {}
+        self._overlay = OptimisticOverlay(OPTIMISTIC_TTL.total_seconds())
+        self._unsub_overlay_expiry: CALLBACK_TYPE | None = None
+        self.device_index = VehicleDeviceIndex(hass, {})
+        base_key_paths = (
+            DISPLAY_NAME,
+            CAR_TYPE,
+            *SCHEDULER_KEY_PATHS,
+            *CHARGE_HISTORY_KEY_PATHS,
+            *SOLAR_KEY_PATHS,
+            *TIMESTAMPS,
+        )
+        self.schema = VehicleSchema((*base_key_paths, *key_paths), normalizers)
+        # Vehicles with the same key paths share one schema
+        schemas: dict[tuple[KeyPath, ...], VehicleSchema] = {}
+        self._vehicle_schemas: dict[str, VehicleSchema] = {}
+        for vin, vin_key_paths in (vehicle_key_paths or {}).items():
+            paths = (*base_key_paths, *vin_key_paths)
+            if (schema := schemas.get(paths)) is None:
+                schema = schemas[paths] = VehicleSchema(paths, normalizers)
+            self._vehicle_schemas[vin] = schema
+        self.breaker = CircuitBreaker(
+            BREAKER_FAILURE_THRESHOLD, BREAKER_RESET_TIMEOUT.total_seconds()
+        )
+        self.data_updated: datetime | None = None
+        self.stale = False
+        self.governor = RequestGovernor(requests_per_minute / 60, DEFAULT_REQUEST_BURST)
+        self.metrics = metrics or CoordinatorMetrics()
+        self.streaming: set[str] = set()
+        # When the record of each vehicle was fetched or streamed
+        self._updated_at: dict[str, float] = {}
+        self.charge_history: dict[str, ChargeHistory] = {}
+        self.solar_controllers: dict[str, SolarChargeController] = {}
+        self.history_importer: HistoryImporter | None = None
+
+        super().__init__(
+            hass, _LOGGER, name=DOMAIN, update_interval=POLL_INTERVAL_DEFAULT
+        )
+
+    async def _async_update_data(self) -> dict[str, VehicleState]:
+        """Update data via library."""
+        start = monotonic()
+        try:
+            return await self._async_update_vehicle_data()
+        finally:
+            self.metrics.record_refresh(monotonic() - start)
+
+    async def _async_update_vehicle_data(self) -> dict[str, VehicleState]:
+        """Poll the due vehicles and work out which entities changed."""
+        self._changed_contexts = None
+        now = monotonic()
+        known = list(self.data) if self.data is not None else []
+        due = self.scheduler.due(known, now)
+
+        if due or not known:
+            if not self.breaker.allow(now):
+                return self._serve_last_good(
+                    UpdateFailed("Requests are paused after repeated failures"), now
+                )
+            try:
+                active_vehicles, polled = await async_retry(
+                    partial(self._async_fetch, known, due),
+                    RETRY_ATTEMPTS,
+                    RETRY_BASE_DELAY,
+                    RETRY_MAX_DELAY,
+                )
+            except UpdateFailed as error:
+                self.breaker.record_failure(now)
+                return self._serve_last_good(error, now)
+            self.breaker.record_success()
+            self.data_updated = dt_util.utcnow()
+            self.stale = False
+        else:
+            active_vehicles, polled = self.data, []
+
+        if active_vehicles is self.data:
+            # Nothing was due, so there is nothing to notify either
+            if self.last_update_success:
+                self._changed_contexts = set()
+            self.update_interval = self.scheduler.next_refresh(now)
+            return active_vehicles
+
+        vehicles = active_vehicles
+        polled = polled or list(vehicles)
+        # Vehicles that streamed or were refreshed on their own while the
+        # poll was in flight keep their newer record
+        if newer := [
+            vin
+            for vin in polled
+            if self._updated_at.get(vin, now) > now and vin in self.data
+        ]:
+            vehicles = vehicles | {vin: self.data[vin] for vin in newer}
+            polled = [vin for vin in polled if vin not in newer]
+        for vin in polled:
+            self._updated_at[vin] = now
+            self.scheduler.schedule(
+                vin,
+                vehicles[vin],
+                now,
+                POLL_INTERVAL_STREAMING if vin in self.streaming else None,
+            )
+        for vin in set(known) - set(vehicles):
+            self.scheduler.remove(vin)
+            self._updated_at.pop(vin, None)
+        self.update_interval = self.scheduler.next_refresh(now)
+        _LOGGER.debug(
+            "Polled %s vehicle(s), next poll in %s", len(polled), self.update_interval
+        )
+
+        # Cached responses keep the previous record of the vehicle
+        old_vehicles = self.data or {}
+        advanced = [vin for vin in polled if vehicles[vin] is not old_vehicles.get(vin)]
+        if (
+            self.data is not None
+            and not advanced
+            and vehicles.keys() == old_vehicles.keys()
+        ):
+            _LOGGER.debug("No vehicle reported new data")
+            if self.last_update_success:
+                self._changed_contexts = {ACCOUNT_CONTEXT}
+            return self.data
+
+        # Entities only need a full fan-out on the first load or when they
+        # are coming back from being unavailable. Optimistic values are only
+        # settled by vehicles that reported new data.
+        settled = self._overlay.reconcile(advanced, now)
+        sampled = self._record_charge_history(vehicles, advanced)
+        if self.data is not None and self.last_update_success:
+            self._changed_contexts = self._diff_contexts(self.data, vehicles, settled)
+            self._changed_contexts |= sampled
+            self._changed_contexts.add(ACCOUNT_CONTEXT)
+
+        if self.store is not None:
+            self.store.async_delay_save(self._snapshot_to_store, SNAPSHOT_SAVE_DELAY)
+        return vehicles
+
+    async def _async_fetch(
+        self, known: list[str], due: list[str]
+    ) -> tuple[dict[str, VehicleState], list[str]]:
+        """Fetch the due vehicles and return the new data and the polled VINs."""
+        if self.concurrent_fetch and known:
+            return await self._async_update_vehicles_concurrently(due)
+
+        try:
+            if len(due) == 1 < len(known):
+                return await self._async_update_vehicles(due), due
+            fleet = self._project_vehicles(
+                await self.async_api_call(
+                    partial(get_state_of_all_vehicles, self.session, self.token, True),
+                    request_timeout=REQUEST_TIMEOUT,
+                )
+            )
+        except (
+            ClientResponseError,
+            ClientError,
+            Exception,
+        ) as error:
+            raise UpdateFailed(error) from error
+        if not known or len(due) == len(known):
+            return fleet, []
+
+        # One fleet request is cheaper than a request per due vehicle. The
+        # vehicles that were not due keep their schedule unless they reported
+        # new data, like a vehicle that woke up while backed off asleep
+        polled = [
+            vin
+            for vin, car in fleet.items()
+            if vin in due
+            or (old := self.data.get(vin)) is None
+            or (car is not old and car.values != old.values)
+        ]
+        return fleet, polled
+
+    def _serve_last_good(
+        self, error: UpdateFailed, now: float
+    ) -> dict[str, VehicleState]:
+        """Keep serving the last good data after a failed refresh.
+
+        Raises the error once the data is older than max_stale_age, which
+        makes the entities unavailable.
+        """
+        self.update_interval = max(
+            self.scheduler.next_refresh(now),
+            timedelta(seconds=self.breaker.retry_in(now)),
+        )
+        if (
+            self.data is None
+            or self.data_updated is None
+            or dt_util.utcnow() - self.data_updated > self.max_stale_age
+        ):
+            raise error
+        if not self.stale:
+            _LOGGER.warning(
+                "Updating Tessie failed (%s), keeping the data from %s",
+                error,
+                self.data_updated,
+            )
+            self.stale = True
+        if self.last_update_success:
+            self._changed_contexts = {ACCOUNT_CONTEXT}
+        return self.data
+
+    def _record_charge_history(
+        self, vehicles: dict[str, VehicleState], vins: Iterable[str]
+    ) -> set[VehicleContext]:
+        """Sample the charge metrics of vehicles that reported new data.
+
+        A buffer is only allocated once a vehicle is seen charging. Returns
+        the charge history contexts of the vehicles that were sampled.
+        """
+        now = time()
+        sampled: set[VehicleContext] = set()
+        for vin in vins:
+            car = vehicles[vin]
+            if (history := self.charge_history.get(vin)) is None:
+                if car.get(CHARGING_STATE) != "Charging":
+                    continue
+                history = self.charge_history[vin] = ChargeHistory(CHARGE_HISTORY_SIZE)
+            if history.record(now, car):
+                sampled.add((vin, CHARGE_HISTORY))
+        return sampled
+
+    def _project_vehicles(self, payload: dict[str, Any]) -> dict[str, VehicleState]:
+        """Project the vehicles of a fleet response, indexed by VIN."""
+        project = self._project
+        return {car["vin"]: project(car) for car in payload.get("results", [])}
+
+    def _project(self, car: dict[str, Any]) -> VehicleState:
+        """Project a vehicle, keeping its previous record if it did not advance."""
+        schema = self.schema_for(car["vin"])
+        if self.data is not None and (old := self.data.get(car["vin"])) is not None:
+            timestamps = [
+                schema.normalize(key_path, key_path(car)) for key_path in TIMESTAMPS
+            ]
+            if (
+                None not in timestamps
+                and timestamps == [old.get(key_path) for key_path in TIMESTAMPS]
+                and VEHICLE_STATE(car) == old.get(VEHICLE_STATE)
+            ):
+                return old
+        return schema.project(car)
+
+    @callback
+    def async_restore_snapshot(self, snapshot: dict[str, Any]) -> None:
+        """Use a persisted snapshot as data until the first live refresh."""
+        if (updated := snapshot.get("updated")) is not None:
+            self.data_updated = dt_util.parse_datetime(updated)
+        if "vehicles" in snapshot:
+            self.data = {
+                vin: self.schema_for(vin).restore(vin, values)
+                for vin, values in snapshot["vehicles"].items()
+            }
+        else:
+            # Snapshots written before vehicles were projected
+            self.data = self._project_vehicles(snapshot)
+        _LOGGER.debug("Restored %s vehicle(s) from storage", len(self.data))
+
+    @callback
+    def _snapshot_to_store(self) -> dict[str, Any]:
+        """Return the part of the snapshot that is persisted."""
+        return {
+            "updated": (
+                self.data_updated.isoformat() if self.data_updated is not None else None
+            ),
+            "vehicles": {vin: car.as_dict() for vin, car in self.data.items()},
+        }
+
+    async def _async_update_vehicles(self, vins: list[str]) -> dict[str, VehicleState]:
+        """Poll only the given vehicles and merge them into the snapshot."""
+        states: dict[str, dict[str, Any]] = {}
+        for vin in vins:
+            states[vin] = await self.async_api_call(
+                partial(get_state, self.session, vin, self.token, True),
+                request_timeout=REQUEST_TIMEOUT,
+            )
+
+        return self._merge_states(states)
+
+    async def _async_update_vehicles_concurrently(
+        self, vins: list[str]
+    ) -> tuple[dict[str, VehicleState], list[str]]:
+        """Poll the given vehicles in parallel and merge those that responded."""
+        if not vins:
+            return self.data, []
+
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def _async_fetch(vin: str) -> dict[str, Any]:
+            async with semaphore:
+                return await self.async_api_call(
+                    partial(get_state, self.session, vin, self.token, True),
+                    request_timeout=self.vehicle_timeout,
+                )
+
+        results = await asyncio.gather(
+            *(_async_fetch(vin) for vin in vins), return_exceptions=True
+        )
+
+        states: dict[str, dict[str, Any]] = {}
+        errors: list[BaseException] = []
+        for vin, result in zip(vins, results):
+            if isinstance(result, Exception):
+                _LOGGER.debug("Polling %s failed: %s", vin, repr(result))
+                errors.append(result)
+            elif isinstance(result, BaseException):
+                raise result
+            else:
+                states[vin] = result
+
+        if not states:
+            raise UpdateFailed(errors[0]) from errors[0]
+        if errors:
+            _LOGGER.warning(
+                "Polling %s of %s vehicles failed, keeping their last state",
+                len(errors),
+                len(vins),
+            )
+
+        return self._merge_states(states), list(states)
+
+    def _merge_states(
+        self, states: dict[str, dict[str, Any]]
+    ) -> dict[str, VehicleState]:
+        """Return a new snapshot with the given vehicle states replaced."""
+        project = self._project
+        return self.data | {
+            vin: project({"vin": vin, "last_state": state})
+            for vin, state in states.items()
+        }
+
+    def _diff_contexts(
+        self,
+        old_vehicles: dict[str, VehicleState],
+        new_vehicles: dict[str, VehicleState],
+        settled: dict[VehicleContext, Any],
+    ) -> set[VehicleContext]:
+        """Return the subscribed contexts whose value differs between snapshots.
+
+        Contexts still held by the overlay keep showing the same value, and
+        the ones settled by this refresh are compared against their
+        optimistic value.
+        """
+        # Vehicles whose tracked values are all equal need no per key check
+        unchanged = {
+            vin
+            for vin, car in new_vehicles.items()
+            if (old_car := old_vehicles.get(vin)) is car
+            or (old_car is not None and old_car.values == car.values)
+        }
+        changed: set[VehicleContext] = set()
+        overlay = self._overlay
+        for context in set(self.async_contexts()):
+            # Listeners without a context are notified on every change anyway,
+            # whether or not async_contexts lists them
+            if context is None or context in overlay:
+                continue
+            vin, key_path = context
+            if context in settled:
+                old = settled[context]
+            elif vin in unchanged:
+                continue
+            else:
+                old = _get(old_vehicles.get(vin), key_path)
+            if old != _get(new_vehicles.get(vin), key_path):
+                changed.add(context)
+        _LOGGER.debug("%s entity contexts changed after refresh", len(changed))
+        return changed
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update the listeners whose context changed in the last refresh."""
+        changed, self._changed_contexts = self._changed_contexts, None
+        if changed is None:
+            update_callbacks = [
+                update_callback for update_callback, _ in self._listeners.values()
+            ]
+        else:
+            update_callbacks = self._context_listeners(changed)
+        self.metrics.record_writes(len(update_callbacks), refresh=True)
+        for update_callback in update_callbacks:
+            update_callback()
+
+    @callback
+    def async_update_context_listeners(self, contexts: set[VehicleContext]) -> None:
+        """Update only the listeners subscribed to one of the given contexts."""
+        update_callbacks = self._context_listeners(contexts)
+        self.metrics.record_writes(len(update_callbacks))
+        for update_callback in update_callbacks:
+            update_callback()
+
+    def _context_listeners(self, contexts: set[VehicleContext]) -> list[CALLBACK_TYPE]:
+        """Return the listeners subscribed to one of the given contexts."""
+        if not contexts:
+            return []
+        return [
+            update_callback
+            for update_callback, context in self._listeners.values()
+            if context is None or context in contexts
+        ]
+
+    async def async_api_call(
+        self,
+        call: Callable[[], Awaitable[_T]],
+        priority: RequestPriority = RequestPriority.POLL,
+        request_timeout: float | None = None,
+    ) -> _T:
+        """Make a request to the Tessie API once the governor lets it through.
+
+        The timeout only covers the request itself, not the wait for the
+        governor.
+        """
+        await self.governor.async_acquire(priority)
+        operation = getattr(call, "func", call).__name__
+        start = monotonic()
+        failed = True
+        try:
+            async with timeout(request_timeout):
+                result = await call()
+            failed = False
+        finally:
+            self.metrics.record_call(operation, monotonic() - start, failed)
+        return result
+
+    async def async_queue_command(
+        self,
+        vin: str,
+        key_path: KeyPath,
+        value: Any,
+        call: Callable[[], Awaitable[Any]],
+    ) -> CommandOutcome:
+        """Send a command changing key_path through the queue of the vehicle."""
+        if (queue := self._command_queues.get(vin)) is None:
+            queue = self._command_queues[vin] = VehicleCommandQueue(self.hass, vin)
+        outcome = await queue.async_submit(
+            key_path.path,
+            value,
+            self.get_value(vin, key_path),
+            partial(self.async_vehicle_command, vin, call),
+        )
+        self.metrics.commands[outcome] += 1
+        return outcome
+
+    async def async_vehicle_command(
+        self, vin: str, call: Callable[[], Awaitable[_T]]
+    ) -> _T:
+        """Send a command to a vehicle, waking it first if it is asleep."""
+        if (manager := self.wake_managers.get(vin)) is None:
+            manager = self.wake_managers[vin] = VehicleWakeManager(
+                self.hass,
+                vin,
+                partial(self._is_asleep, vin),
+                partial(
+                    self.async_api_call,
+                    partial(wake, self.session, vin, self.token),
+                    RequestPriority.COMMAND,
+                    WAKE_TIMEOUT,
+                ),
+                partial(self._async_set_awake, vin),
+            )
+        result = await manager.async_run(
+            partial(self.async_api_call, call, RequestPriority.COMMAND)
+        )
+        self.async_schedule_vehicle_refresh(vin)
+        return result
+
+    @callback
+    def async_schedule_vehicle_refresh(self, vin: str) -> None:
+        """Poll one vehicle shortly, coalescing the requests made meanwhile."""
+        if (refresher := self._vehicle_refreshers.get(vin)) is None:
+            refresher = self._vehicle_refreshers[vin] = Debouncer(
+                self.hass,
+                _LOGGER,
+                cooldown=VEHICLE_REFRESH_DELAY,
+                immediate=False,
+                function=partial(self._async_refresh_vehicle, vin),
+            )
+        refresher.async_schedule_call()
+
+    async def _async_refresh_vehicle(self, vin: str) -> None:
+        """Poll the live state of one vehicle and merge it into the snapshot."""
+        if self.data is None or vin not in self.data:
+            return
+        now = monotonic()
+        try:
+            state = await self.async_api_call(
+                partial(get_state, self.session, vin, self.token, False),
+                request_timeout=REQUEST_TIMEOUT,
+            )
+        except Exception as err:  # pylint: disable=broad-except
+            _LOGGER.debug("Refreshing %s failed: %s", vin, err)
+            return
+        if vin not in self.data or self._updated_at.get(vin, now) > now:
+            # Removed, or updated by a poll or the stream meanwhile
+            return
+
+        self._updated_at[vin] = now
+        old_vehicles = self.data
+        vehicles = self._merge_states({vin: state})
+        self.scheduler.schedule(
+            vin,
+            vehicles[vin],
+            now,
+            POLL_INTERVAL_STREAMING if vin in self.streaming else None,
+        )
+        if vehicles[vin] is old_vehicles[vin]:
+            return
+        settled = self._overlay.reconcile([vin], now)
+        changed = self._diff_contexts(old_vehicles, vehicles, settled)
+        changed |= self._record_charge_history(vehicles, (vin,))
+        self.data = vehicles
+        _LOGGER.debug("Refreshed %s, %s context(s) changed", vin, len(changed))
+        self.async_update_context_listeners(changed)
+        if self.store is not None:
+            self.store.async_delay_save(self._snapshot_to_store, SNAPSHOT_SAVE_DELAY)
+
+    def _is_asleep(self, vin: str) -> bool:
+        """Return if a vehicle was asleep or offline when last seen."""
+        return self.get_value(vin, VEHICLE_STATE) in SLEEPING_STATES
+
+    @callback
+    def _async_set_awake(self, vin: str) -> None:
+        """Mark a vehicle online after waking it, until the next poll."""
+        if self.get_vehicle(vin) is not None:
+            self.async_set_optimistic_value(vin, VEHICLE_STATE, "online")
+
+    @callback
+    def async_start_streaming(self, entry: ConfigEntry) -> None:
+        """Open a telemetry stream for every known vehicle."""
+        for vin in self.data or {}:
+            entry.async_create_background_task(
+                self.hass,
+                VehicleStream(self, vin).async_run(),
+                f"{DOMAIN} stream {vin}",
+            )
+
+    @callback
+    def async_set_streaming(self, vin: str, connected: bool) -> None:
+        """Track whether a vehicle is streaming, polling it again once it is not."""
+        if connected:
+            self.streaming.add(vin)
+            if (car := self.get_vehicle(vin)) is not None:
+                self.scheduler.schedule(vin, car, monotonic(), POLL_INTERVAL_STREAMING)
+        else:
+            self.streaming.discard(vin)
+            self.scheduler.remove(vin)
+
+    @callback
+    def async_apply_stream_update(self, vin: str, updates: dict[KeyPath, Any]) -> None:
+        """Apply streamed values to a vehicle and update the affected entities.
+
+        Streamed values are live data, so they also settle the optimistic
+        values of their contexts.
+        """
+        self.metrics.stream_messages += 1
+        if (car := self.get_vehicle(vin)) is None or not updates:
+            return
+        updated = car.replace(updates)
+        changed = {
+            (vin, key_path)
+            for key_path in updates
+            if updated.get(key_path) != car.get(key_path)
+        }
+        settled = self._overlay.settle((vin, key_path) for key_path in updates)
+        if settled:
+            self._async_schedule_overlay_expiry()
+        if changed:
+            self._updated_at[vin] = monotonic()
+            self.data = self.data | {vin: updated}
+            changed |= self._record_charge_history(self.data, (vin,))
+            if self.store is not None:
+                self.store.async_delay_save(
+                    self._snapshot_to_store, SNAPSHOT_SAVE_DELAY
+                )
+        self.async_update_context_listeners(changed | settled)
+
+    @callback
+    def async_set_optimistic_value(
+        self, vin: str, key_path: KeyPath, value: Any
+    ) -> None:
+        """Show a value until a later poll confirms or contradicts it."""
+        context = (vin, key_path)
+        self._overlay.set(context, value, monotonic())
+        self._async_schedule_overlay_expiry()
+        self.async_update_context_listeners({context})
+
+    @callback
+    def _async_schedule_overlay_expiry(self) -> None:
+        """Schedule the removal of the next optimistic value to expire."""
+        if self._unsub_overlay_expiry is not None:
+            self._unsub_overlay_expiry()
+            self._unsub_overlay_expiry = None
+        if (expires := self._overlay.next_expiry()) is not None:
+            self._unsub_overlay_expiry = async_call_later(
+                self.hass, max(expires - monotonic(), 0), self._async_expire_overlay
+            )
+
+    @callback
+    def _async_expire_overlay(self, _now: Any) -> None:
+        """Drop the expired optimistic values and update their entities."""
+        self._unsub_overlay_expiry = None
+        expired = self._overlay.expire(monotonic())
+        self._async_schedule_overlay_expiry()
+        self.async_update_context_listeners(expired)
+
+    async def async_shutdown(self) -> None:
+        """Cancel pending timers and waiting requests on shutdown."""
+        await super().async_shutdown()
+        self.governor.cancel()
+        for refresher in self._vehicle_refreshers.values():
+            refresher.async_shutdown()
+        if self._unsub_overlay_expiry is not None:
+            self._unsub_overlay_expiry()
+            self._unsub_overlay_expiry = None
+
+    def schema_for(self, vin: str) -> VehicleSchema:
+        """Return the schema of the key paths kept for a vehicle."""
+        return self._vehicle_schemas.get(vin, self.schema)
+
+    def get_value(self, vin: str, key_path: KeyPath) -> Any:
+        """Return the value of a key path, preferring optimistic values."""
+        if self._overlay and (vin, key_path) in self._overlay:
+            return self._overlay[(vin, key_path)]
+        return _get(self.get_vehicle(vin), key_path)
+
+    def get_vehicle(self, vin: str) -> VehicleState | None:
+        """Return the latest state of a vehicle by its VIN."""
+        if self.data is None:
+            return None
+        return self.data.get(vin)
+
+
+def _get(car: VehicleState | None, key_path: KeyPath) -> Any:
+    """Return the value of a key path of a vehicle that may be missing."""
+    return None if car is None else car.get(key_path)
@@ -0,0 +1,58 @@
+"""Diagnostics support for Tessie."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import ACCESS_TOKEN, DOMAIN
+from .coordinator import TessieDataUpdateCoordinator
+
+TO_REDACT = {ACCESS_TOKEN, "vin", "last_state.display_name"}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return the performance counters and vehicle state of a config entry."""
+    coordinator: TessieDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
+    governor = coordinator.governor
+
+    return {
+        "entry": async_redact_data(entry.as_dict(), TO_REDACT),
+        "coordinator": {
+            "last_update_success": coordinator.last_update_success,
+            "data_updated": coordinator.data_updated,
+            "stale": coordinator.stale,
+            "update_interval": str(coordinator.update_interval),
+            "circuit_open": coordinator.breaker.is_open,
+            "listeners": sum(1 for _ in coordinator.async_contexts()),
+            "streaming": len(coordinator.streaming),
+            "wakes": sum(
+                manager.wakes for manager in coordinator.wake_managers.values()
+            ),
+            "solar_commands": sum(
+                controller.commands
+                for controller in coordinator.solar_controllers.values()
+            ),
+            "history_imported": (
+                coordinator.history_importer.imported
+                if coordinator.history_importer is not None
+                else None
+            ),
+        },
+        "governor": {
+            "requests": governor.requests,
+            "queue_depth": governor.queue_depth,
+            "max_queue_depth": governor.max_queue_depth,
+            "average_wait": governor.average_wait,
+            "max_wait": governor.max_wait,
+        },
+        "metrics": coordinator.metrics.as_dict(),
+        "vehicles": [
+            async_redact_data(car.as_dict(), TO_REDACT)
+            for car in (coordinator.data or {}).values()
+        ],
+    }
@@ -5,7 +5,9 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from . import DOMAIN, TessieDataUpdateCoordinator
+from .const import DOMAIN
+from .coordinator import TessieDataUpdateCoordinator
+from .helpers import VehicleContext, compile_key_path
 
 
 class BaseTessieSensor(CoordinatorEntity, SensorEntity):
@@ -21,10 +23,12 @@ class BaseTessieSensor(CoordinatorEntity, SensorEntity):
         config_entry: ConfigEntry,
         description: SensorEntityDescription,
         coordinator: TessieDataUpdateCoordinator,
+        context: VehicleContext | None = None,
     ) -> None:
-        """Initialize the sensor."""
+        """Initialize the sensor, listening to its own key path by default."""
 
-        super().__init__(coordinator)
+        self.key_path = compile_key_path(description.key)
+        super().__init__(coordinator, context or (vin, self.key_path))
 
         self.deviceName = name
         self.deviceModel = model
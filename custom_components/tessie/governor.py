@@ -0,0 +1,116 @@
+"""Rate limiting of the requests an account makes to the Tessie API."""
+from __future__ import annotations
+
+import asyncio
+from enum import IntEnum
+import heapq
+from itertools import count
+from time import monotonic
+
+# Weight of the latest wait in the moving average of waits
+WAIT_SMOOTHING = 0.1
+
+
+class RequestPriority(IntEnum):
+    """Order in which waiting requests are let through, lowest first."""
+
+    COMMAND = 0
+    POLL = 1
+    BACKGROUND = 2
+
+
+class RequestGovernor:
+    """Token bucket shared by every request of one account.
+
+    The bucket holds up to burst tokens and refills at rate tokens per
+    second. A request takes one token, or waits in a queue ordered by
+    priority and then by arrival, so commands overtake queued polls and
+    polls overtake queued background requests.
+    """
+
+    def __init__(self, rate: float, burst: int) -> None:
+        """Initialize the governor with a full bucket."""
+        self._rate = rate
+        self._burst = burst
+        self._tokens = float(burst)
+        self._updated = monotonic()
+        self._waiters: list[tuple[int, int, asyncio.Future[None]]] = []
+        self._order = count()
+        self._timer: asyncio.TimerHandle | None = None
+
+        self.requests = 0
+        self.max_queue_depth = 0
+        self.average_wait = 0.0
+        self.max_wait = 0.0
+
+    @property
+    def queue_depth(self) -> int:
+        """Return the number of requests waiting for a token."""
+        return sum(not future.done() for _, _, future in self._waiters)
+
+    async def async_acquire(self, priority: RequestPriority) -> float:
+        """Wait until a request may be made and return how long that took."""
+        start = monotonic()
+        self._refill(start)
+        if not self._waiters and self._tokens >= 1:
+            self._tokens -= 1
+            self._record(0.0)
+            return 0.0
+
+        future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._order), future))
+        self.max_queue_depth = max(self.max_queue_depth, len(self._waiters))
+        self._schedule()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # The token was granted just before the cancellation
+                self._tokens = min(self._tokens + 1, self._burst)
+                self._schedule()
+            raise
+
+        wait = monotonic() - start
+        self._record(wait)
+        return wait
+
+    def _refill(self, now: float) -> None:
+        """Add the tokens earned since the last refill."""
+        self._tokens = min(
+            self._tokens + (now - self._updated) * self._rate, self._burst
+        )
+        self._updated = now
+
+    def _schedule(self) -> None:
+        """Wake the queue once the next token is available."""
+        if self._timer is not None or not self._waiters:
+            return
+        delay = max((1 - self._tokens) / self._rate, 0)
+        self._timer = asyncio.get_running_loop().call_later(delay, self._dispatch)
+
+    def _dispatch(self) -> None:
+        """Hand the available tokens to the waiters first in line."""
+        self._timer = None
+        self._refill(monotonic())
+        while self._waiters and self._tokens >= 1:
+            _, _, future = heapq.heappop(self._waiters)
+            if future.done():
+                continue
+            self._tokens -= 1
+            future.set_result(None)
+        self._schedule()
+
+    def _record(self, wait: float) -> None:
+        """Update the wait statistics."""
+        self.requests += 1
+        self.average_wait += (wait - self.average_wait) * WAIT_SMOOTHING
+        self.max_wait = max(self.max_wait, wait)
+
+    def cancel(self) -> None:
+        """Stop dispatching, cancelling the requests still waiting."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        for _, _, future in self._waiters:
+            future.cancel()
+        self._waiters.clear()
@@ -0,0 +1,52 @@
+"""Helpers shared by the Tessie platforms."""
+from __future__ import annotations
+
+from collections.abc import Mapping
+from functools import lru_cache
+from typing import Any
+
+from .const import CONF_SENSOR_GROUPS, SENSOR_GROUPS
+
+
+class KeyPath:
+    """Dot notation key path compiled once into a reusable accessor."""
+
+    __slots__ = ("path", "_keys")
+
+    def __init__(self, path: str) -> None:
+        """Split the key path up front so lookups never have to."""
+        self.path = path
+        self._keys = tuple(path.split("."))
+
+    def __repr__(self) -> str:
+        """Return the representation of the key path."""
+        return f"KeyPath({self.path!r})"
+
+    def __call__(self, data: Any) -> Any:
+        """Get the value at the key path, or None if any part is missing."""
+        value = data
+        try:
+            for key in self._keys:
+                value = value[key]
+        except (KeyError, TypeError, IndexError):
+            return None
+        return value
+
+
+# Coordinator listener context of an entity showing one key path of one car
+VehicleContext = tuple[str, KeyPath]
+
+
+@lru_cache(maxsize=None)
+def compile_key_path(path: str) -> KeyPath:
+    """Return the shared compiled accessor for a dot notation key path."""
+    return KeyPath(path)
+
+
+# Context of the entities describing the account rather than one vehicle
+ACCOUNT_CONTEXT: VehicleContext = ("", compile_key_path(""))
+
+
+def get_sensor_groups(options: Mapping[str, Any], vin: str) -> list[str]:
+    """Return the sensor groups picked for a vehicle in the entry options."""
+    return list(options.get(CONF_SENSOR_GROUPS, {}).get(vin, SENSOR_GROUPS))
@@ -0,0 +1,321 @@
+"""Backfill of the past charges and drives of each vehicle into statistics.
+
+Tessie keeps the charges and drives of a vehicle, returned for a window of
+start times:
+
+    GET /{vin}/charges?from=...&to=...  {"results": [{"started_at": ...,
+        "ended_at": ..., "energy_added": ..., "starting_battery": ...,
+        "ending_battery": ...}, ...]}
+    GET /{vin}/drives?from=...&to=...   {"results": [{..., "odometer_distance":
+        ...}, ...]}
+
+The records are imported as hourly external statistics: the energy added
+and the distance driven as running sums, and the battery levels seen at
+the start and end of the charges and of the drives as an hourly mean,
+minimum and maximum each.
+"""
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime
+from functools import partial
+import logging
+from time import time
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+from aiohttp import ClientError, ClientSession
+from tessie_api.tessie_wrapper import tessieRequest
+
+from homeassistant.components.recorder.models import StatisticData, StatisticMetaData
+from homeassistant.components.recorder.statistics import async_add_external_statistics
+from homeassistant.const import PERCENTAGE, UnitOfEnergy, UnitOfLength
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    DOMAIN,
+    HISTORY_BACKFILL,
+    HISTORY_INTERVAL,
+    HISTORY_PAGE,
+    HISTORY_PAGE_DELAY,
+    REQUEST_TIMEOUT,
+)
+from .governor import RequestPriority
+from .models import DISPLAY_NAME
+
+if TYPE_CHECKING:
+    from .coordinator import TessieDataUpdateCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class HistoryKind(NamedTuple):
+    """A kind of record and the statistics imported from it."""
+
+    endpoint: str
+    field: str
+    statistic: str
+    name: str
+    unit: str
+    battery_statistic: str
+    battery_name: str
+
+
+HISTORY_KINDS = (
+    HistoryKind(
+        "charges",
+        "energy_added",
+        "charge_energy",
+        "Charge energy",
+        UnitOfEnergy.KILO_WATT_HOUR,
+        "charge_battery_level",
+        "Charge battery level",
+    ),
+    HistoryKind(
+        "drives",
+        "odometer_distance",
+        "drive_distance",
+        "Drive distance",
+        UnitOfLength.KILOMETERS,
+        "drive_battery_level",
+        "Drive battery level",
+    ),
+)
+
+
+async def get_history(
+    session: ClientSession, vin: str, api_key: str, endpoint: str, start: int, end: int
+) -> dict[str, Any]:
+    """Return the records of a vehicle that started between start and end."""
+    return await tessieRequest(
+        session,
+        "GET",
+        f"/{vin}/{endpoint}",
+        api_key,
+        params={
+            "from": start,
+            "to": end,
+            "distance_format": "km",
+            "format": "json",
+            "timezone": "UTC",
+        },
+    )
+
+
+def _hour(timestamp: float) -> datetime:
+    """Return the start of the hour a unix timestamp falls in."""
+    return dt_util.utc_from_timestamp(timestamp).replace(
+        minute=0, second=0, microsecond=0
+    )
+
+
+def _value(record: dict[str, Any], key: str) -> float | None:
+    """Return a number of a record, or None if it is missing."""
+    try:
+        return float(record[key])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def _timestamp(record: dict[str, Any], key: str) -> float | None:
+    """Return a unix timestamp of a record, or None if it is not valid."""
+    if (value := _value(record, key)) is None or value <= 0:
+        return None
+    return value
+
+
+class HistoryImporter:
+    """Import the charges and drives of every vehicle of an account.
+
+    Records are fetched oldest first, a page of HISTORY_PAGE at a time, as
+    background requests behind every poll and command. Each page is imported
+    in one batch per statistic, after which the cursor and running sum of
+    the vehicle are persisted, so an interrupted backfill resumes where it
+    stopped. Once caught up, only records newer than the cursor are fetched.
+
+    A record still in progress holds the cursor at its start until it ended.
+    Battery levels are aggregated per hour in the cursor as well, so an hour
+    that spans two pages is written with the levels of both, and is only
+    dropped once no record after the cursor can fall into it.
+    Records without valid start and end times are skipped, and a vehicle
+    whose import fails is retried on the next run.
+    """
+
+    def __init__(
+        self,
+        coordinator: TessieDataUpdateCoordinator,
+        store: Store[dict[str, Any]],
+    ) -> None:
+        """Initialize the importer."""
+        self._coordinator = coordinator
+        self._store = store
+        self._cursors: dict[str, dict[str, dict[str, Any]]] = {}
+        self.imported = 0
+
+    async def async_run(self) -> None:
+        """Import new records of every vehicle, then again every interval."""
+        self._cursors = await self._store.async_load() or {}
+        while True:
+            for vin in list(self._coordinator.data or {}):
+                for kind in HISTORY_KINDS:
+                    try:
+                        await self._async_import(vin, kind)
+                    except (ClientError, TimeoutError) as err:
+                        _LOGGER.debug(
+                            "Importing the %s of %s failed: %s", kind.endpoint, vin, err
+                        )
+                    except Exception:  # pylint: disable=broad-except
+                        _LOGGER.exception(
+                            "Unexpected error importing the %s of %s",
+                            kind.endpoint,
+                            vin,
+                        )
+            await asyncio.sleep(HISTORY_INTERVAL.total_seconds())
+
+    async def _async_import(self, vin: str, kind: HistoryKind) -> None:
+        """Import the records of one kind that are newer than the cursor."""
+        coordinator = self._coordinator
+        now = int(time())
+        cursor = self._cursors.setdefault(vin, {}).setdefault(
+            kind.endpoint,
+            {
+                "from": now - int(HISTORY_BACKFILL.total_seconds()),
+                "last_end": 0,
+                "sum": 0.0,
+            },
+        )
+        while cursor["from"] < now:
+            start = cursor["from"]
+            end = min(start + int(HISTORY_PAGE.total_seconds()), now)
+            payload = await coordinator.async_api_call(
+                partial(
+                    get_history,
+                    coordinator.session,
+                    vin,
+                    coordinator.token,
+                    kind.endpoint,
+                    start,
+                    end,
+                ),
+                RequestPriority.BACKGROUND,
+                REQUEST_TIMEOUT,
+            )
+            finished: list[dict[str, Any]] = []
+            in_progress: list[int] = []
+            for record in payload.get("results") or []:
+                if (started := _timestamp(record, "started_at")) is None:
+                    _LOGGER.debug("Skipping a %s record of %s", kind.endpoint, vin)
+                elif not record.get("ended_at"):
+                    in_progress.append(int(started))
+                elif (ended := _timestamp(record, "ended_at")) is None:
+                    _LOGGER.debug("Skipping a %s record of %s", kind.endpoint, vin)
+                elif ended > cursor["last_end"]:
+                    finished.append(record | {"started_at": started, "ended_at": ended})
+            self._import_records(
+                vin,
+                kind,
+                cursor,
+                sorted(finished, key=lambda record: record["ended_at"]),
+            )
+            cursor["from"] = min(in_progress, default=end)
+            first_open = _hour(cursor["from"]).isoformat()
+            cursor["levels"] = {
+                hour: bucket
+                for hour, bucket in cursor.get("levels", {}).items()
+                if hour >= first_open
+            }
+            await self._store.async_save(self._cursors)
+            if in_progress:
+                break
+            await asyncio.sleep(HISTORY_PAGE_DELAY)
+
+    def _import_records(
+        self,
+        vin: str,
+        kind: HistoryKind,
+        cursor: dict[str, Any],
+        records: list[dict[str, Any]],
+    ) -> None:
+        """Add a page of finished records, oldest first, to the statistics."""
+        if not records:
+            return
+        sums: dict[datetime, float] = {}
+        # Mean, minimum, maximum and count of the levels of each open hour
+        levels: dict[str, list[float]] = cursor.setdefault("levels", {})
+        touched: set[str] = set()
+        for record in records:
+            cursor["sum"] += _value(record, kind.field) or 0.0
+            cursor["last_end"] = record["ended_at"]
+            sums[_hour(record["ended_at"])] = cursor["sum"]
+            for at, key in (
+                ("started_at", "starting_battery"),
+                ("ended_at", "ending_battery"),
+            ):
+                if record.get(at) and (level := _value(record, key)) is not None:
+                    hour = _hour(record[at]).isoformat()
+                    touched.add(hour)
+                    if (bucket := levels.get(hour)) is None:
+                        levels[hour] = [level, level, level, 1]
+                        continue
+                    mean, low, high, count = bucket
+                    levels[hour] = [
+                        mean + (level - mean) / (count + 1),
+                        min(low, level),
+                        max(high, level),
+                        count + 1,
+                    ]
+
+        self._add_statistics(
+            vin,
+            kind.statistic,
+            kind.name,
+            kind.unit,
+            [StatisticData(start=hour, sum=total) for hour, total in sums.items()],
+            has_sum=True,
+        )
+        self._add_statistics(
+            vin,
+            kind.battery_statistic,
+            kind.battery_name,
+            PERCENTAGE,
+            [
+                StatisticData(
+                    start=dt_util.parse_datetime(hour),
+                    mean=levels[hour][0],
+                    min=levels[hour][1],
+                    max=levels[hour][2],
+                )
+                for hour in sorted(touched)
+            ],
+            has_mean=True,
+        )
+        self.imported += len(records)
+        _LOGGER.debug("Imported %s %s of %s", len(records), kind.endpoint, vin)
+
+    def _add_statistics(
+        self,
+        vin: str,
+        statistic: str,
+        name: str,
+        unit: str,
+        rows: list[StatisticData],
+        has_sum: bool = False,
+        has_mean: bool = False,
+    ) -> None:
+        """Queue a batch of hourly rows of one statistic of a vehicle."""
+        if not rows:
+            return
+        car = self._coordinator.get_vehicle(vin)
+        display_name = (car.get(DISPLAY_NAME) if car is not None else None) or vin
+        async_add_external_statistics(
+            self._coordinator.hass,
+            StatisticMetaData(
+                has_mean=has_mean,
+                has_sum=has_sum,
+                name=f"{display_name} {name}",
+                source=DOMAIN,
+                statistic_id=f"{DOMAIN}:{vin.lower()}_{statistic}",
+                unit_of_measurement=unit,
+            ),
+            rows,
+        )
@@ -0,0 +1,141 @@
+"""Performance counters of a Tessie account."""
+from __future__ import annotations
+
+from bisect import bisect_left
+from collections import Counter, defaultdict
+from types import SimpleNamespace
+from typing import Any
+
+from aiohttp import ClientSession, TraceConfig, TraceResponseChunkReceivedParams
+
+# Upper bounds in seconds of the latency histogram buckets
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class LatencyHistogram:
+    """Counts of durations in fixed buckets, with their sum and maximum."""
+
+    __slots__ = ("counts", "count", "total", "max")
+
+    def __init__(self) -> None:
+        """Initialize an empty histogram."""
+        self.counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float) -> None:
+        """Add a duration."""
+        self.counts[bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def percentile(self, fraction: float) -> float | None:
+        """Return the bucket bound below which the fraction of durations fall."""
+        if not self.count:
+            return None
+        rank = fraction * self.count
+        seen = 0
+        for bound, count in zip(LATENCY_BUCKETS, self.counts):
+            seen += count
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the histogram as plain data."""
+        return {
+            "count": self.count,
+            "mean": self.total / self.count if self.count else None,
+            "p50": self.percentile(0.5),
+            "p95": self.percentile(0.95),
+            "max": self.max,
+            "buckets": {
+                **{
+                    f"<={bound}": count
+                    for bound, count in zip(LATENCY_BUCKETS, self.counts)
+                },
+                f">{LATENCY_BUCKETS[-1]}": self.counts[-1],
+            },
+        }
+
+
+class CoordinatorMetrics:
+    """Request, payload, refresh, entity write and stream counters of one account."""
+
+    def __init__(self) -> None:
+        """Initialize the counters."""
+        self.latency: defaultdict[str, LatencyHistogram] = defaultdict(LatencyHistogram)
+        self.errors: Counter[str] = Counter()
+        self.commands: Counter[str] = Counter()
+        self.refresh = LatencyHistogram()
+        self.last_refresh: float | None = None
+        self.responses = 0
+        self.payload_bytes = 0
+        self.last_payload_bytes: int | None = None
+        self.max_payload_bytes = 0
+        self.entity_writes = 0
+        self.last_refresh_writes: int | None = None
+        self.stream_messages = 0
+
+    def record_call(self, operation: str, seconds: float, failed: bool) -> None:
+        """Add an API request and whether it raised."""
+        self.latency[operation].record(seconds)
+        if failed:
+            self.errors[operation] += 1
+
+    def record_refresh(self, seconds: float) -> None:
+        """Add a coordinator refresh."""
+        self.refresh.record(seconds)
+        self.last_refresh = seconds
+
+    def record_payload(self, size: int) -> None:
+        """Add the size in bytes of a response body."""
+        self.responses += 1
+        self.payload_bytes += size
+        self.last_payload_bytes = size
+        self.max_payload_bytes = max(self.max_payload_bytes, size)
+
+    def record_writes(self, writes: int, refresh: bool = False) -> None:
+        """Add the entity state writes of a refresh or another update."""
+        self.entity_writes += writes
+        if refresh:
+            self.last_refresh_writes = writes
+
+    def trace_config(self) -> TraceConfig:
+        """Return an aiohttp trace config recording the response sizes."""
+
+        async def _on_chunk(
+            session: ClientSession,
+            context: SimpleNamespace,
+            params: TraceResponseChunkReceivedParams,
+        ) -> None:
+            self.record_payload(len(params.chunk))
+
+        trace_config = TraceConfig()
+        trace_config.on_response_chunk_received.append(_on_chunk)
+        return trace_config
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the counters as plain data."""
+        return {
+            "latency": {
+                operation: histogram.as_dict()
+                for operation, histogram in sorted(self.latency.items())
+            },
+            "errors": dict(self.errors),
+            "commands": dict(self.commands),
+            "refresh": self.refresh.as_dict(),
+            "payload": {
+                "responses": self.responses,
+                "total_bytes": self.payload_bytes,
+                "last_bytes": self.last_payload_bytes,
+                "max_bytes": self.max_payload_bytes,
+            },
+            "entity_writes": {
+                "total": self.entity_writes,
+                "last_refresh": self.last_refresh_writes,
+            },
+            "stream_messages": self.stream_messages,
+        }
@@ -0,0 +1,114 @@
+"""Compact vehicle state records for the Tessie coordinator."""
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping
+from typing import Any
+
+from .helpers import KeyPath, compile_key_path
+from .normalize import Normalizer
+
+DISPLAY_NAME = compile_key_path("last_state.display_name")
+CAR_TYPE = compile_key_path("last_state.vehicle_config.car_type")
+
+# Sub-state timestamps that advance whenever the vehicle reports new data
+TIMESTAMPS = tuple(
+    compile_key_path(f"last_state.{sub_state}.timestamp")
+    for sub_state in ("charge_state", "climate_state", "vehicle_state", "drive_state")
+)
+
+
+class VehicleSchema:
+    """The key paths kept for every vehicle, in slot order.
+
+    Values are converted to their native type by the normalizer of their key
+    path as they enter a record, so reading a record is a plain lookup.
+    """
+
+    __slots__ = ("paths", "slots", "normalizers", "_fields")
+
+    def __init__(
+        self,
+        paths: Iterable[KeyPath],
+        normalizers: Mapping[KeyPath, Normalizer] | None = None,
+    ) -> None:
+        """Initialize the schema, dropping duplicate key paths."""
+        self.paths = tuple(dict.fromkeys(paths))
+        self.slots = {key_path: slot for slot, key_path in enumerate(self.paths)}
+        normalizers = normalizers or {}
+        self.normalizers = {
+            key_path: normalizers[key_path]
+            for key_path in self.paths
+            if key_path in normalizers
+        }
+        self._fields = tuple(
+            (key_path, self.normalizers.get(key_path)) for key_path in self.paths
+        )
+
+    def normalize(self, key_path: KeyPath, value: Any) -> Any:
+        """Return a value converted to the native type of its key path."""
+        if (normalizer := self.normalizers.get(key_path)) is None:
+            return value
+        return normalizer(value)
+
+    def project(self, car: dict[str, Any]) -> VehicleState:
+        """Keep only the tracked values of a vehicle from the API payload."""
+        return VehicleState(
+            car["vin"],
+            self,
+            tuple(
+                key_path(car) if normalizer is None else normalizer(key_path(car))
+                for key_path, normalizer in self._fields
+            ),
+        )
+
+    def restore(self, vin: str, values: dict[str, Any]) -> VehicleState:
+        """Rebuild a vehicle from the values saved by VehicleState.as_dict."""
+        return VehicleState(
+            vin,
+            self,
+            tuple(
+                values.get(key_path.path)
+                if normalizer is None
+                else normalizer(values.get(key_path.path))
+                for key_path, normalizer in self._fields
+            ),
+        )
+
+
+class VehicleState:
+    """Projected state of one vehicle, holding only the tracked values."""
+
+    __slots__ = ("vin", "schema", "values")
+
+    def __init__(self, vin: str, schema: VehicleSchema, values: tuple) -> None:
+        """Initialize the record."""
+        self.vin = vin
+        self.schema = schema
+        self.values = values
+
+    def __repr__(self) -> str:
+        """Return the representation of the record."""
+        return f"VehicleState({self.vin!r}, {len(self.values)} values)"
+
+    def get(self, key_path: KeyPath) -> Any:
+        """Return the value of a tracked key path, or None."""
+        slot = self.schema.slots.get(key_path)
+        if slot is None:
+            return None
+        return self.values[slot]
+
+    def replace(self, updates: dict[KeyPath, Any]) -> VehicleState:
+        """Return a copy of the record with the tracked key paths updated."""
+        values = list(self.values)
+        schema = self.schema
+        for key_path, value in updates.items():
+            if (slot := schema.slots.get(key_path)) is not None:
+                values[slot] = schema.normalize(key_path, value)
+        return VehicleState(self.vin, self.schema, tuple(values))
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the tracked values keyed by their dot notation path."""
+        return {
+            key_path.path: value
+            for key_path, value in zip(self.schema.paths, self.values)
+        }
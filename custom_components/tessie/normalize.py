@@ -0,0 +1,80 @@
+"""Conversion of raw vehicle values into the native types of their sensors.
+
+Every normalizer accepts the raw API value as well as its own output, and
+the string the output is persisted as, so values can be normalized again
+after a snapshot is restored.
+"""
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable
+from datetime import datetime
+import logging
+from typing import Any
+
+from homeassistant.util import dt as dt_util
+
+_LOGGER = logging.getLogger(__name__)
+
+# Placeholder the API reports for values a vehicle does not have
+INVALID = "<invalid>"
+
+Normalizer = Callable[[Any], Any]
+
+
+def number(value: Any) -> int | float | None:
+    """Normalize a number, which may be reported as a string."""
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return value
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        pass
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def text(value: Any) -> str | None:
+    """Normalize a free form string, dropping the invalid placeholder."""
+    if value is None or value == INVALID:
+        return None
+    return str(value)
+
+
+def enum(options: Iterable[str]) -> Normalizer:
+    """Return a normalizer of an enum that passes unknown values through.
+
+    A value outside the known options, such as one added by a firmware
+    update, is logged the first time it is seen.
+    """
+    known = frozenset(options)
+    unknown: set[str] = set()
+
+    def _normalize(value: Any) -> str | None:
+        if (value := text(value)) is None or value in known:
+            return value
+        if value not in unknown:
+            unknown.add(value)
+            _LOGGER.info("Unknown value %s, expected one of %s", value, sorted(known))
+        return value
+
+    return _normalize
+
+
+def epoch(scale: float = 1) -> Normalizer:
+    """Return a normalizer of epoch timestamps counted in 1 / scale seconds."""
+
+    def _normalize(value: Any) -> datetime | None:
+        if isinstance(value, datetime):
+            return value
+        # Epochs may be reported as strings, persisted datetimes are ISO strings
+        if (seconds := number(value)) is None:
+            return dt_util.parse_datetime(value) if isinstance(value, str) else None
+        if seconds <= 0:
+            return None
+        return dt_util.utc_from_timestamp(seconds / scale)
+
+    return _normalize
@@ -0,0 +1,79 @@
+"""Optimistic state overlay for the Tessie coordinator."""
+from __future__ import annotations
+
+from collections.abc import Iterable
+from typing import Any, NamedTuple
+
+from .helpers import VehicleContext
+
+
+class _OptimisticValue(NamedTuple):
+    """A value written after a command, waiting for a poll to confirm it."""
+
+    value: Any
+    written: float
+    expires: float
+
+
+class OptimisticOverlay:
+    """Optimistic values kept apart from the polled snapshot.
+
+    Entries are keyed by VIN and key path and expire after a TTL. A snapshot
+    fetched after an entry was written settles it: either the car confirmed
+    the value or it contradicted it, and in both cases the snapshot wins.
+    """
+
+    def __init__(self, ttl: float) -> None:
+        """Initialize the overlay."""
+        self._ttl = ttl
+        self._entries: dict[VehicleContext, _OptimisticValue] = {}
+
+    def __bool__(self) -> bool:
+        """Return if the overlay holds any value."""
+        return bool(self._entries)
+
+    def __contains__(self, context: VehicleContext) -> bool:
+        """Return if the overlay holds a value for the context."""
+        return context in self._entries
+
+    def __getitem__(self, context: VehicleContext) -> Any:
+        """Return the optimistic value of the context."""
+        return self._entries[context].value
+
+    def set(self, context: VehicleContext, value: Any, now: float) -> None:
+        """Store an optimistic value for the context."""
+        self._entries[context] = _OptimisticValue(value, now, now + self._ttl)
+
+    def reconcile(
+        self, vins: list[str], fetched_at: float
+    ) -> dict[VehicleContext, Any]:
+        """Drop and return the values of vehicles polled after they were written."""
+        polled = set(vins)
+        settled = {
+            context: entry.value
+            for context, entry in self._entries.items()
+            if context[0] in polled and entry.written <= fetched_at
+        }
+        for context in settled:
+            del self._entries[context]
+        return settled
+
+    def settle(self, contexts: Iterable[VehicleContext]) -> set[VehicleContext]:
+        """Drop and return the values of contexts that received live data."""
+        settled = {context for context in contexts if context in self._entries}
+        for context in settled:
+            del self._entries[context]
+        return settled
+
+    def expire(self, now: float) -> set[VehicleContext]:
+        """Drop the values whose TTL has passed."""
+        expired = {
+            context for context, entry in self._entries.items() if entry.expires <= now
+        }
+        for context in expired:
+            del self._entries[context]
+        return expired
+
+    def next_expiry(self) -> float | None:
+        """Return when the next value expires."""
+        return min((entry.expires for entry in self._entries.values()), default=None)
@@ -0,0 +1,101 @@
+"""Retries and circuit breaking for requests to the Tessie API."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+import logging
+import random
+from typing import TypeVar
+
+from aiohttp import ClientError, ClientResponseError
+
+from homeassistant.helpers.update_coordinator import UpdateFailed
+
+_LOGGER = logging.getLogger(__name__)
+
+_T = TypeVar("_T")
+
+
+def is_transient(error: BaseException) -> bool:
+    """Return if an error is worth retrying, looking through UpdateFailed."""
+    if isinstance(error, UpdateFailed) and error.__cause__ is not None:
+        error = error.__cause__
+    if isinstance(error, ClientResponseError):
+        return error.status == 429 or error.status >= 500
+    return isinstance(error, (ClientError, TimeoutError))
+
+
+async def async_retry(
+    call: Callable[[], Awaitable[_T]],
+    attempts: int,
+    base_delay: float,
+    max_delay: float,
+) -> _T:
+    """Await call, retrying transient errors with jittered exponential backoff.
+
+    The delay before retry n is drawn uniformly between zero and
+    base_delay * 2**n, capped at max_delay, so clients that failed together
+    do not retry together.
+    """
+    for attempt in range(attempts):
+        try:
+            return await call()
+        except Exception as error:  # pylint: disable=broad-except
+            if attempt + 1 >= attempts or not is_transient(error):
+                raise
+            delay = random.uniform(0, min(max_delay, base_delay * 2**attempt))
+            _LOGGER.debug(
+                "Attempt %s failed (%s), retrying in %.1fs", attempt + 1, error, delay
+            )
+            await asyncio.sleep(delay)
+    raise AssertionError("attempts must be at least 1")
+
+
+class CircuitBreaker:
+    """Stop calling an API that keeps failing until it had time to recover.
+
+    After failure_threshold consecutive failures the breaker opens and
+    allow() refuses calls for reset_timeout seconds. Then a single trial call
+    is let through: success closes the breaker, failure opens it again.
+    """
+
+    def __init__(self, failure_threshold: int, reset_timeout: float) -> None:
+        """Initialize the breaker in the closed state."""
+        self._failure_threshold = failure_threshold
+        self._reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at: float | None = None
+
+    @property
+    def is_open(self) -> bool:
+        """Return if calls are currently being refused or trialled."""
+        return self._opened_at is not None
+
+    def allow(self, now: float) -> bool:
+        """Return if a call may be made at the given time."""
+        return self._opened_at is None or now >= self._opened_at + self._reset_timeout
+
+    def retry_in(self, now: float) -> float:
+        """Return the seconds until the next trial call is allowed."""
+        if self._opened_at is None:
+            return 0.0
+        return max(self._opened_at + self._reset_timeout - now, 0.0)
+
+    def record_success(self) -> None:
+        """Close the breaker after a successful call."""
+        if self._opened_at is not None:
+            _LOGGER.info("Tessie API recovered, closing the circuit breaker")
+        self._failures = 0
+        self._opened_at = None
+
+    def record_failure(self, now: float) -> None:
+        """Count a failed call and open the breaker past the threshold."""
+        self._failures += 1
+        if self._opened_at is not None or self._failures >= self._failure_threshold:
+            if self._opened_at is None:
+                _LOGGER.warning(
+                    "Tessie API failed %s times in a row, pausing requests for %ss",
+                    self._failures,
+                    self._reset_timeout,
+                )
+            self._opened_at = now
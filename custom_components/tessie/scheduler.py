@@ -0,0 +1,88 @@
+"""Per vehicle polling schedule for the Tessie coordinator."""
+from __future__ import annotations
+
+from datetime import timedelta
+
+from .const import (
+    POLL_INTERVAL_ACTIVE,
+    POLL_INTERVAL_ASLEEP,
+    POLL_INTERVAL_ASLEEP_MAX,
+    POLL_INTERVAL_DEFAULT,
+    POLL_INTERVAL_MIN,
+    POLL_INTERVAL_PARKED,
+)
+from .helpers import compile_key_path
+from .models import VehicleState
+
+VEHICLE_STATE = compile_key_path("last_state.state")
+CHARGING_STATE = compile_key_path("last_state.charge_state.charging_state")
+SHIFT_STATE = compile_key_path("last_state.drive_state.shift_state")
+LOCKED = compile_key_path("last_state.vehicle_state.locked")
+
+# Key paths the schedule is picked from, kept in every vehicle record
+SCHEDULER_KEY_PATHS = (VEHICLE_STATE, CHARGING_STATE, SHIFT_STATE, LOCKED)
+
+SLEEPING_STATES = ("asleep", "offline")
+
+# Poll vehicles that fall due this close to a refresh together with it
+DUE_SLACK = 5.0
+
+
+def poll_interval(car: VehicleState, asleep_polls: int = 0) -> timedelta:
+    """Return how long to wait before polling a car in its current state."""
+    if car.get(VEHICLE_STATE) in SLEEPING_STATES:
+        return min(POLL_INTERVAL_ASLEEP * 2**asleep_polls, POLL_INTERVAL_ASLEEP_MAX)
+    driving = car.get(SHIFT_STATE) not in (None, "P")
+    if car.get(CHARGING_STATE) == "Charging" or driving:
+        return POLL_INTERVAL_ACTIVE
+    if car.get(LOCKED) is True:
+        return POLL_INTERVAL_PARKED
+    return POLL_INTERVAL_DEFAULT
+
+
+class VehiclePollScheduler:
+    """Keep track of when each vehicle is next due to be polled."""
+
+    def __init__(self) -> None:
+        """Initialize the scheduler."""
+        self._next_due: dict[str, float] = {}
+        self._asleep_polls: dict[str, int] = {}
+
+    def due(self, vins: list[str], now: float) -> list[str]:
+        """Return the vehicles that should be polled at the given time."""
+        deadline = now + DUE_SLACK
+        return [vin for vin in vins if self._next_due.get(vin, now) <= deadline]
+
+    def schedule(
+        self,
+        vin: str,
+        car: VehicleState,
+        now: float,
+        min_interval: timedelta | None = None,
+    ) -> None:
+        """Schedule the next poll of a vehicle from its freshly polled state.
+
+        min_interval stretches the interval, for vehicles whose state also
+        arrives by other means.
+        """
+        asleep_polls = self._asleep_polls.get(vin, 0)
+        interval = poll_interval(car, asleep_polls)
+        if min_interval is not None:
+            interval = max(interval, min_interval)
+        if car.get(VEHICLE_STATE) in SLEEPING_STATES:
+            self._asleep_polls[vin] = asleep_polls + 1
+        else:
+            self._asleep_polls.pop(vin, None)
+        self._next_due[vin] = now + interval.total_seconds()
+
+    def next_refresh(self, now: float) -> timedelta:
+        """Return the delay until the first vehicle is due again."""
+        if not self._next_due:
+            return POLL_INTERVAL_DEFAULT
+        delay = timedelta(seconds=min(self._next_due.values()) - now)
+        return max(delay, POLL_INTERVAL_MIN)
+
+    def remove(self, vin: str) -> None:
+        """Forget a vehicle that is no longer reported."""
+        self._next_due.pop(vin, None)
+        self._asleep_polls.pop(vin, None)
@@ -2,57 +2,272 @@
 
 from __future__ import annotations
 
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime
 from typing import Any
 
-from homeassistant.components.sensor import SensorDeviceClass, SensorEntityDescription
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorEntityDescription,
+    SensorStateClass,
+)
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import (
     PERCENTAGE,
+    EntityCategory,
     Platform,
     UnitOfElectricCurrent,
     UnitOfElectricPotential,
     UnitOfEnergy,
+    UnitOfInformation,
     UnitOfLength,
     UnitOfPower,
     UnitOfTime,
 )
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from . import DOMAIN, TessieDataUpdateCoordinator
+from .charge_history import CHARGE_HISTORY, ChargeHistory
+from .const import (
+    CHARGE_AVERAGE_WINDOW,
+    DOMAIN,
+    SENSOR_GROUP_CHARGING,
+    SENSOR_GROUP_CORE,
+    SENSOR_GROUP_DIAGNOSTICS,
+    SENSOR_GROUP_SCHEDULING,
+)
+from .coordinator import TessieDataUpdateCoordinator
 from .entity import BaseTessieSensor
+from .helpers import ACCOUNT_CONTEXT, get_sensor_groups
+from .models import CAR_TYPE, DISPLAY_NAME
+from .normalize import Normalizer, enum, epoch, number, text
+
+
+class TessieCarSensor(BaseTessieSensor):
+    """Used to represent a SemsInformationSensor."""
+
+    @property
+    def native_value(self):
+        """Return the state of the sensor."""
+
+        return self.coordinator.get_value(self.vin, self.key_path)
+
 
+@dataclass(frozen=True, kw_only=True)
+class TessieSensorEntityDescription(SensorEntityDescription):
+    """Describes a vehicle sensor and the sensor group it belongs to.
 
-def traverse_nested_dict(data_dict, key_path):
-    """Get a value by a dot notation."""
+    normalize converts the raw value to the native value of the sensor when
+    it is not implied by the device class or unit.
+    """
 
-    keys = key_path.split(".")
-    value = data_dict
-    for key in keys:
-        value = value.get(key)
-        if value is None:
+    group: str
+    normalize: Normalizer | None = None
+
+
+def get_normalizer(description: TessieSensorEntityDescription) -> Normalizer | None:
+    """Return the normalizer of the values of a vehicle sensor, if any."""
+    if description.normalize is not None:
+        return description.normalize
+    if description.native_unit_of_measurement is not None:
+        return number
+    return None
+
+
+@dataclass(frozen=True, kw_only=True)
+class TessieChargeSensorEntityDescription(TessieSensorEntityDescription):
+    """Describes a statistic derived from the charge history of a vehicle."""
+
+    value_fn: Callable[[ChargeHistory], float | None]
+
+
+class TessieChargeStatisticSensor(BaseTessieSensor):
+    """Statistic of the recent charge samples of a vehicle."""
+
+    entity_description: TessieChargeSensorEntityDescription
+
+    def __init__(
+        self,
+        name: str,
+        model: str,
+        vin: str,
+        config_entry: ConfigEntry,
+        description: TessieChargeSensorEntityDescription,
+        coordinator: TessieDataUpdateCoordinator,
+    ) -> None:
+        """Initialize the sensor, listening for new charge samples."""
+        super().__init__(
+            name,
+            model,
+            vin,
+            config_entry,
+            description,
+            coordinator,
+            (vin, CHARGE_HISTORY),
+        )
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the statistic, or None before the vehicle was seen charging."""
+        if (history := self.coordinator.charge_history.get(self.vin)) is None:
             return None
-    return value
+        return self.entity_description.value_fn(history)
 
 
-class TessieCarSensor(BaseTessieSensor):
-    """Used to represent a SemsInformationSensor."""
+class TessieAccountSensor(CoordinatorEntity, SensorEntity):
+    """Diagnostic sensor of the Tessie account, updated after each refresh."""
+
+    coordinator: TessieDataUpdateCoordinator
 
-    def getCarByVin(self, coordinator: TessieDataUpdateCoordinator, vin: str) -> Any:
-        """Retrieve the inverter by name."""
+    _attr_has_entity_name = True
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
 
-        for car in coordinator.data["results"]:
-            if car["vin"] == vin:
-                return car
-        return None
+    def __init__(
+        self, coordinator: TessieDataUpdateCoordinator, config_entry: ConfigEntry
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator, ACCOUNT_CONTEXT)
+        self._attr_unique_id = f"{config_entry.entry_id}-{self._attr_translation_key}"
+        self._attr_device_info = coordinator.device_info
+
+
+class TessieLastUpdateSensor(TessieAccountSensor):
+    """When the vehicle data was last fetched, and whether it is stale."""
+
+    _attr_translation_key = "last_update"
+    _attr_device_class = SensorDeviceClass.TIMESTAMP
 
     @property
-    def native_value(self):
-        """Return the state of the sensor."""
+    def native_value(self) -> datetime | None:
+        """Return when the vehicle data was last fetched."""
+        return self.coordinator.data_updated
 
-        return traverse_nested_dict(
-            self.getCarByVin(self.coordinator, self.vin), self.entity_description.key
-        )
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return whether refreshes are failing and the data is stale."""
+        return {"stale": self.coordinator.stale}
+
+
+class TessieRefreshDurationSensor(TessieAccountSensor):
+    """How long the last refresh took, with the percentiles of all refreshes."""
+
+    _attr_translation_key = "refresh_duration"
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_native_unit_of_measurement = UnitOfTime.SECONDS
+    _attr_suggested_display_precision = 2
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the duration of the last refresh."""
+        return self.coordinator.metrics.last_refresh
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the percentiles of the refresh durations."""
+        refresh = self.coordinator.metrics.refresh
+        return {
+            "p50": _round(refresh.percentile(0.5)),
+            "p95": _round(refresh.percentile(0.95)),
+            "max": _round(refresh.max),
+            "refreshes": refresh.count,
+        }
+
+
+class TessieApiErrorsSensor(TessieAccountSensor):
+    """Number of failed API requests, with the count of each operation."""
+
+    _attr_translation_key = "api_errors"
+    _attr_state_class = SensorStateClass.TOTAL_INCREASING
+
+    @property
+    def native_value(self) -> int:
+        """Return the number of failed requests."""
+        return self.coordinator.metrics.errors.total()
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the failed requests of each operation."""
+        return dict(self.coordinator.metrics.errors)
+
+
+class TessiePayloadSizeSensor(TessieAccountSensor):
+    """Size of the last API response, with the average and largest size."""
+
+    _attr_translation_key = "payload_size"
+    _attr_device_class = SensorDeviceClass.DATA_SIZE
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_native_unit_of_measurement = UnitOfInformation.BYTES
+
+    @property
+    def native_value(self) -> int | None:
+        """Return the size of the last response."""
+        return self.coordinator.metrics.last_payload_bytes
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the average and largest response size."""
+        metrics = self.coordinator.metrics
+        return {
+            "average": (
+                metrics.payload_bytes // metrics.responses
+                if metrics.responses
+                else None
+            ),
+            "max": metrics.max_payload_bytes,
+        }
+
+
+class TessieEntityWritesSensor(TessieAccountSensor):
+    """Entity state writes caused by the last refresh, and in total."""
+
+    _attr_translation_key = "entity_writes"
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    @property
+    def native_value(self) -> int | None:
+        """Return the entity writes caused by the last refresh."""
+        return self.coordinator.metrics.last_refresh_writes
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the entity writes since the integration was loaded."""
+        return {"total": self.coordinator.metrics.entity_writes}
+
+
+class TessieApiWaitSensor(TessieAccountSensor):
+    """Average time requests wait for the rate limit, with the queue depth."""
+
+    _attr_translation_key = "api_wait"
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_native_unit_of_measurement = UnitOfTime.SECONDS
+    _attr_suggested_display_precision = 2
+
+    @property
+    def native_value(self) -> float:
+        """Return the moving average of the time requests waited."""
+        return self.coordinator.governor.average_wait
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the queue statistics of the rate limit."""
+        governor = self.coordinator.governor
+        return {
+            "queue_depth": governor.queue_depth,
+            "max_queue_depth": governor.max_queue_depth,
+            "max_wait": _round(governor.max_wait),
+            "requests": governor.requests,
+        }
+
+
+def _round(seconds: float | None) -> float | None:
+    """Round a duration to milliseconds for the state attributes."""
+    return None if seconds is None else round(seconds, 3)
 
 
 async def async_setup_entry(
@@ -64,335 +279,513 @@ async def async_setup_entry(
 
     coordinator: TessieDataUpdateCoordinator = hass.data[DOMAIN][config_entry.entry_id]
 
-    cars = coordinator.data["results"]
+    cars = coordinator.data.values()
+    groups = {car.vin: get_sensor_groups(config_entry.options, car.vin) for car in cars}
+
+    # Disable the registry entries of sensors whose group is no longer
+    # picked, and enable them again once it is, keeping their settings
+    entity_registry = er.async_get(hass)
+    for car in cars:
+        for description in (*SENSOR_INFO_TYPES_TESLA, *CHARGE_STATISTIC_TYPES):
+            if (
+                entity_id := entity_registry.async_get_entity_id(
+                    Platform.SENSOR,
+                    DOMAIN,
+                    f"{car.get(DISPLAY_NAME)}-{description.key}",
+                )
+            ) is None:
+                continue
+            disabled_by = entity_registry.async_get(entity_id).disabled_by
+            if description.group not in groups[car.vin]:
+                if disabled_by is None:
+                    entity_registry.async_update_entity(
+                        entity_id, disabled_by=er.RegistryEntryDisabler.INTEGRATION
+                    )
+            elif (
+                disabled_by is er.RegistryEntryDisabler.INTEGRATION
+                and description.entity_registry_enabled_default
+            ):
+                entity_registry.async_update_entity(entity_id, disabled_by=None)
 
     teslaCarInfoEntities = [
         TessieCarSensor(
-            car["last_state"]["display_name"],
-            car["last_state"]["vehicle_config"]["car_type"],
-            car["vin"],
+            car.get(DISPLAY_NAME),
+            car.get(CAR_TYPE),
+            car.vin,
             config_entry,
             description,
             coordinator,
         )
         for description in SENSOR_INFO_TYPES_TESLA
         for car in cars
+        if description.group in groups[car.vin]
+    ]
+    chargeStatisticEntities = [
+        TessieChargeStatisticSensor(
+            car.get(DISPLAY_NAME),
+            car.get(CAR_TYPE),
+            car.vin,
+            config_entry,
+            description,
+            coordinator,
+        )
+        for description in CHARGE_STATISTIC_TYPES
+        for car in cars
+        if description.group in groups[car.vin]
     ]
 
-    async_add_entities(teslaCarInfoEntities)
+    async_add_entities(
+        [
+            *teslaCarInfoEntities,
+            *chargeStatisticEntities,
+            TessieLastUpdateSensor(coordinator, config_entry),
+            TessieApiWaitSensor(coordinator, config_entry),
+            TessieRefreshDurationSensor(coordinator, config_entry),
+            TessieApiErrorsSensor(coordinator, config_entry),
+            TessiePayloadSizeSensor(coordinator, config_entry),
+            TessieEntityWritesSensor(coordinator, config_entry),
+        ]
+    )
 
 
-SENSOR_INFO_TYPES_TESLA: tuple[SensorEntityDescription, ...] = (
-    SensorEntityDescription(
+SENSOR_INFO_TYPES_TESLA: tuple[TessieSensorEntityDescription, ...] = (
+    TessieSensorEntityDescription(
         translation_key="display_name",
         key="last_state.display_name",
         native_unit_of_measurement=None,
         device_class=None,
+        group=SENSOR_GROUP_CORE,
     ),
-    SensorEntityDescription(
+    TessieSensorEntityDescription(
         translation_key="vin",
         key="vin",
         native_unit_of_measurement=None,
         device_class=None,
+        group=SENSOR_GROUP_DIAGNOSTICS,
     ),
-    SensorEntityDescription(
+    TessieSensorEntityDescription(
         translation_key="battery_heater_on",
         key="last_state.charge_state.battery_heater_on",
         native_unit_of_measurement=None,
         device_class=None,
+        group=SENSOR_GROUP_CHARGING,
     ),
-    SensorEntityDescription(
+    TessieSensorEntityDescription(
         translation_key="battery_level",
         key="last_state.charge_state.battery_level",
         native_unit_of_measurement=PERCENTAGE,
         device_class=SensorDeviceClass.BATTERY,
+        group=SENSOR_GROUP_CORE,
     ),
-    SensorEntityDescription(
+    TessieSensorEntityDescription(
         translation_key="battery_range",
         key="last_state.charge_state.battery_range",
         native_unit_of_measurement=UnitOfLength.MILES,
         device_class=SensorDeviceClass.DISTANCE,
+        group=SENSOR_GROUP_CORE,
     ),
-    SensorEntityDescription(
+    TessieSensorEntityDescription(
         translation_key="charge_amps",
         key="last_state.charge_state.charge_amps",
         native_unit_of_measurement=UnitOfElectricCurrent.AMPERE,
         device_class=SensorDeviceClass.CURRENT,
+        group=SENSOR_GROUP_CHARGING,
     ),
-    SensorEntityDescription(
+    TessieSensorEntityDescription(
         translation_key="charge_current_request",
         key="last_state.charge_state.charge_current_request",
         native_unit_of_measurement=UnitOfElectricCurrent.AMPERE,
         device_class=SensorDeviceClass.CURRENT,
+        group=SENSOR_GROUP_CHARGING,
     ),
-    SensorEntityDescription(
+    TessieSensorEntityDescription(
         translation_key="charge_current_request_max",
         key="last_state.charge_state.charge_current_request_max",
         native_unit_of_measurement=UnitOfElectricCurrent.AMPERE,
         device_class=SensorDeviceClass.CURRENT,
+        group=SENSOR_GROUP_CHARGING,
     ),
-    SensorEntityDescription(
+    TessieSensorEntityDescription(
         translation_key="charge_enable_request",
         key="last_state.charge_state.charge_enable_request",
         native_unit_of_measurement=None,
         device_class=None,
+        group=SENSOR_GROUP_DIAGNOSTICS,
+        entity_registry_enabled_default=False,
     ),
-    SensorEntityDescription(
+    TessieSensorEntityDescription(
         translation_key="charge_energy_added",
         key="last_state.charge_state.charge_energy_added",
         native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
         device_class=SensorDeviceClass.ENERGY,
+        group=SENSOR_GROUP_CORE,
     ),
-    SensorEntityDescription(
+    TessieSensorEntityDescription(
         translation_key="charge_limit_soc",
         key="last_state.charge_state.charge_limit_soc",
         native_unit_of_measurement=PERCENTAGE,
         device_class=SensorDeviceClass.BATTERY,
+        group=SENSOR_GROUP_CORE,
     ),
-    SensorEntityDescription(
+    TessieSensorEntityDescription(
         translation_key="charge_limit_soc_max",
         key="last_state.charge_state.charge_limit_soc_max",
         native_unit_of_measurement=PERCENTAGE,
         device_class=SensorDeviceClass.BATTERY,
+        group=SENSOR_GROUP_DIAGNOSTICS,
+        entity_registry_enabled_default=False,
     ),
-    SensorEntityDescription(
+    TessieSensorEntityDescription(
         translation_key="charge_limit_soc_min",
         key="last_state.charge_state.charge_limit_soc_min",
         native_unit_of_measurement=PERCENTAGE,
         device_class=SensorDeviceClass.BATTERY,
+        group=SENSOR_GROUP_DIAGNOSTICS,
+        entity_registry_enabled_default=False,
     ),
-    SensorEntityDescription(
+    TessieSensorEntityDescription(
         translation_key="charge_limit_soc_std",
         key="last_state.charge_state.charge_limit_soc_std",
         native_unit_of_measurement=PERCENTAGE,
         device_class=SensorDeviceClass.BATTERY,
+        group=SENSOR_GROUP_DIAGNOSTICS,
+        entity_registry_enabled_default=False,
     ),
-    SensorEntityDescription(
+    TessieSensorEntityDescription(
         translation_key="charge_miles_added_ideal",
         key="last_state.charge_state.charge_miles_added_ideal",
         native_unit_of_measurement=UnitOfLength.MILES,
         device_class=SensorDeviceClass.DISTANCE,
+        group=SENSOR_GROUP_CHARGING,
+        entity_registry_enabled_default=False,
     ),
-    SensorEntityDescription(
+    TessieSensorEntityDescription(
         translation_key="charge_miles_added_rated",
         key="last_state.charge_state.charge_miles_added_rated",
         native_unit_of_measurement=UnitOfLength.MILES,
         device_class=SensorDeviceClass.DISTANCE,
+        group=SENSOR_GROUP_CHARGING,
     ),
-    SensorEntityDescription(
+    TessieSensorEntityDescription(
         translation_key="charge_port_cold_weather_mode",
         key="last_state.charge_state.charge_port_cold_weather_mode",
         native_unit_of_measurement=None,
         device_class=None,
+        group=SENSOR_GROUP_CHARGING,
+        entity_registry_enabled_default=False,
     ),
-    SensorEntityDescription(
+    TessieSensorEntityDescription(
         translation_key="charge_port_color",
         key="last_state.charge_state.charge_port_color",
         native_unit_of_measurement=None,
         device_class=None,
+        normalize=text,
+        group=SENSOR_GROUP_DIAGNOSTICS,
+        entity_registry_enabled_default=False,
     ),
-    SensorEntityDescription(
+    TessieSensorEntityDescription(
         translation_key="charge_port_door_open",
         key="last_state.charge_state.charge_port_door_open",
         native_unit_of_measurement=None,
         device_class=None,
+        group=SENSOR_GROUP_CORE,
     ),
-    SensorEntityDescription(
+    TessieSensorEntityDescription(
         translation_key="charge_port_latch",
         key="last_state.charge_state.charge_port_latch",
         native_unit_of_measurement=None,
         device_class=None,
+        normalize=enum(["Blocking", "Disengaged", "Engaged"]),
+        group=SENSOR_GROUP_CHARGING,
     ),
-    SensorEntityDescription(
+    TessieSensorEntityDescription(
         translation_key="charge_rate",
         key="last_state.charge_state.charge_rate",
         native_unit_of_measurement=UnitOfElectricCurrent.AMPERE,
         device_class=SensorDeviceClass.CURRENT,
+        group=SENSOR_GROUP_CHARGING,
     ),
-    SensorEntityDescription(
+    TessieSensorEntityDescription(
         translation_key="charger_actual_current",
         key="last_state.charge_state.charger_actual_current",
         native_unit_of_measurement=UnitOfElectricCurrent.AMPERE,
         device_class=SensorDeviceClass.CURRENT,
+        group=SENSOR_GROUP_CHARGING,
     ),
-    SensorEntityDescription(
+    TessieSensorEntityDescription(
         translation_key="charger_phases",
         key="last_state.charge_state.charger_phases",
         native_unit_of_measurement=Platform.NUMBER,
         device_class=None,
+        group=SENSOR_GROUP_CHARGING,
     ),
-    SensorEntityDescription(
+    TessieSensorEntityDescription(
         translation_key="charger_pilot_current",
         key="last_state.charge_state.charger_pilot_current",
         native_unit_of_measurement=UnitOfElectricCurrent.AMPERE,
         device_class=SensorDeviceClass.CURRENT,
+        group=SENSOR_GROUP_CHARGING,
     ),
-    SensorEntityDescription(
+    TessieSensorEntityDescription(
         translation_key="charger_power",
         key="last_state.charge_state.charger_power",
         native_unit_of_measurement=UnitOfPower.KILO_WATT,
         device_class=SensorDeviceClass.POWER,
+        group=SENSOR_GROUP_CORE,
     ),
-    SensorEntityDescription(
+    TessieSensorEntityDescription(
         translation_key="charger_voltage",
         key="last_state.charge_state.charger_voltage",
         native_unit_of_measurement=UnitOfElectricPotential.VOLT,
         device_class=SensorDeviceClass.VOLTAGE,
+        group=SENSOR_GROUP_CHARGING,
     ),
-    SensorEntityDescription(
+    TessieSensorEntityDescription(
         translation_key="charging_state",
         key="last_state.charge_state.charging_state",
         native_unit_of_measurement=None,
         device_class=None,
-    ),
-    SensorEntityDescription(
+        normalize=enum(
+            [
+                "Charging",
+                "Complete",
+                "Disconnected",
+                "NoPower",
+                "Starting",
+                "Stopped",
+            ]
+        ),
+        group=SENSOR_GROUP_CORE,
+    ),
+    TessieSensorEntityDescription(
         translation_key="conn_charge_cable",
         key="last_state.charge_state.conn_charge_cable",
         native_unit_of_measurement=None,
         device_class=None,
+        normalize=enum(["GB_AC", "GB_DC", "IEC", "SAE"]),
+        group=SENSOR_GROUP_CHARGING,
     ),
-    SensorEntityDescription(
+    TessieSensorEntityDescription(
         translation_key="est_battery_range",
         key="last_state.charge_state.est_battery_range",
         native_unit_of_measurement=UnitOfLength.MILES,
         device_class=SensorDeviceClass.DISTANCE,
+        group=SENSOR_GROUP_CORE,
     ),
-    SensorEntityDescription(
+    TessieSensorEntityDescription(
         translation_key="fast_charger_brand",
         key="last_state.charge_state.fast_charger_brand",
         native_unit_of_measurement=None,
         device_class=None,
+        normalize=text,
+        group=SENSOR_GROUP_CHARGING,
+        entity_registry_enabled_default=False,
     ),
-    SensorEntityDescription(
+    TessieSensorEntityDescription(
         translation_key="fast_charger_present",
         key="last_state.charge_state.fast_charger_present",
         native_unit_of_measurement=None,
         device_class=None,
+        group=SENSOR_GROUP_CHARGING,
     ),
-    SensorEntityDescription(
+    TessieSensorEntityDescription(
         translation_key="fast_charger_type",
         key="last_state.charge_state.fast_charger_type",
         native_unit_of_measurement=None,
         device_class=None,
+        normalize=text,
+        group=SENSOR_GROUP_CHARGING,
+        entity_registry_enabled_default=False,
     ),
-    SensorEntityDescription(
+    TessieSensorEntityDescription(
         translation_key="ideal_battery_range",
         key="last_state.charge_state.ideal_battery_range",
         native_unit_of_measurement=UnitOfLength.MILES,
         device_class=SensorDeviceClass.DISTANCE,
+        group=SENSOR_GROUP_CHARGING,
     ),
-    SensorEntityDescription(
+    TessieSensorEntityDescription(
         translation_key="max_range_charge_counter",
         key="last_state.charge_state.max_range_charge_counter",
         native_unit_of_measurement=None,
         device_class=None,
+        normalize=number,
+        group=SENSOR_GROUP_DIAGNOSTICS,
+        entity_registry_enabled_default=False,
     ),
-    SensorEntityDescription(
+    TessieSensorEntityDescription(
         translation_key="minutes_to_full_charge",
         key="last_state.charge_state.minutes_to_full_charge",
         native_unit_of_measurement=UnitOfTime.MINUTES,
         device_class=SensorDeviceClass.DURATION,
+        group=SENSOR_GROUP_CHARGING,
     ),
-    SensorEntityDescription(
+    TessieSensorEntityDescription(
         translation_key="not_enough_power_to_heat",
         key="last_state.charge_state.not_enough_power_to_heat",
         native_unit_of_measurement=None,
         device_class=None,
+        group=SENSOR_GROUP_DIAGNOSTICS,
+        entity_registry_enabled_default=False,
     ),
-    SensorEntityDescription(
+    TessieSensorEntityDescription(
         translation_key="off_peak_charging_enabled",
         key="last_state.charge_state.off_peak_charging_enabled",
         native_unit_of_measurement=None,
         device_class=None,
+        group=SENSOR_GROUP_SCHEDULING,
     ),
-    SensorEntityDescription(
+    TessieSensorEntityDescription(
         translation_key="off_peak_charging_times",
         key="last_state.charge_state.off_peak_charging_times",
         native_unit_of_measurement=None,
         device_class=None,
+        normalize=enum(["all_week", "weekdays"]),
+        group=SENSOR_GROUP_SCHEDULING,
     ),
-    SensorEntityDescription(
+    TessieSensorEntityDescription(
         translation_key="off_peak_hours_end_time",
         key="last_state.charge_state.off_peak_hours_end_time",
         native_unit_of_measurement=None,
         device_class=None,
+        normalize=number,
+        group=SENSOR_GROUP_SCHEDULING,
+        entity_registry_enabled_default=False,
     ),
-    SensorEntityDescription(
+    TessieSensorEntityDescription(
         translation_key="preconditioning_enabled",
         key="last_state.charge_state.preconditioning_enabled",
         native_unit_of_measurement=None,
         device_class=None,
+        group=SENSOR_GROUP_SCHEDULING,
     ),
-    SensorEntityDescription(
+    TessieSensorEntityDescription(
         translation_key="preconditioning_times",
         key="last_state.charge_state.preconditioning_times",
         native_unit_of_measurement=None,
         device_class=None,
+        normalize=enum(["all_week", "weekdays"]),
+        group=SENSOR_GROUP_SCHEDULING,
     ),
-    SensorEntityDescription(
+    TessieSensorEntityDescription(
         translation_key="scheduled_charging_mode",
         key="last_state.charge_state.scheduled_charging_mode",
         native_unit_of_measurement=None,
         device_class=None,
+        normalize=enum(["DepartBy", "Off", "StartAt"]),
+        group=SENSOR_GROUP_SCHEDULING,
     ),
-    SensorEntityDescription(
+    TessieSensorEntityDescription(
         translation_key="scheduled_charging_pending",
         key="last_state.charge_state.scheduled_charging_pending",
         native_unit_of_measurement=None,
         device_class=None,
+        group=SENSOR_GROUP_SCHEDULING,
     ),
-    SensorEntityDescription(
+    TessieSensorEntityDescription(
         translation_key="scheduled_charging_start_time",
         key="last_state.charge_state.scheduled_charging_start_time",
         native_unit_of_measurement=None,
-        device_class=None,
+        device_class=SensorDeviceClass.TIMESTAMP,
+        normalize=epoch(),
+        group=SENSOR_GROUP_SCHEDULING,
     ),
-    SensorEntityDescription(
+    TessieSensorEntityDescription(
         translation_key="scheduled_departure_time",
         key="last_state.charge_state.scheduled_departure_time",
         native_unit_of_measurement=None,
-        device_class=None,
+        device_class=SensorDeviceClass.TIMESTAMP,
+        normalize=epoch(),
+        group=SENSOR_GROUP_SCHEDULING,
     ),
-    SensorEntityDescription(
+    TessieSensorEntityDescription(
         translation_key="scheduled_departure_time_minutes",
         key="last_state.charge_state.scheduled_departure_time_minutes",
         native_unit_of_measurement=None,
         device_class=None,
+        normalize=number,
+        group=SENSOR_GROUP_SCHEDULING,
+        entity_registry_enabled_default=False,
     ),
-    SensorEntityDescription(
+    TessieSensorEntityDescription(
         translation_key="supercharger_session_trip_planner",
         key="last_state.charge_state.supercharger_session_trip_planner",
         native_unit_of_measurement=None,
         device_class=None,
+        group=SENSOR_GROUP_SCHEDULING,
+        entity_registry_enabled_default=False,
     ),
-    SensorEntityDescription(
+    TessieSensorEntityDescription(
         translation_key="time_to_full_charge",
         key="last_state.charge_state.time_to_full_charge",
         native_unit_of_measurement=UnitOfTime.MINUTES,
         device_class=SensorDeviceClass.DURATION,
+        group=SENSOR_GROUP_CORE,
     ),
-    SensorEntityDescription(
+    TessieSensorEntityDescription(
         translation_key="timestamp",
         key="last_state.charge_state.timestamp",
         native_unit_of_measurement=None,
-        device_class=None,
+        device_class=SensorDeviceClass.TIMESTAMP,
+        normalize=epoch(1000),
+        group=SENSOR_GROUP_DIAGNOSTICS,
+        entity_registry_enabled_default=False,
     ),
-    SensorEntityDescription(
+    TessieSensorEntityDescription(
         translation_key="trip_charging",
         key="last_state.charge_state.trip_charging",
         native_unit_of_measurement=None,
         device_class=None,
+        group=SENSOR_GROUP_SCHEDULING,
     ),
-    SensorEntityDescription(
+    TessieSensorEntityDescription(
         translation_key="usable_battery_level",
         key="last_state.charge_state.usable_battery_level",
         native_unit_of_measurement=PERCENTAGE,
         device_class=SensorDeviceClass.BATTERY,
+        group=SENSOR_GROUP_CORE,
     ),
-    SensorEntityDescription(
+    TessieSensorEntityDescription(
         translation_key="user_charge_enable_request",
         key="last_state.charge_state.user_charge_enable_request",
         native_unit_of_measurement=None,
         device_class=None,
+        group=SENSOR_GROUP_DIAGNOSTICS,
+        entity_registry_enabled_default=False,
+    ),
+)
+
+CHARGE_STATISTIC_TYPES: tuple[TessieChargeSensorEntityDescription, ...] = (
+    TessieChargeSensorEntityDescription(
+        translation_key="average_charger_power",
+        key="charge_history.average_charger_power",
+        native_unit_of_measurement=UnitOfPower.KILO_WATT,
+        device_class=SensorDeviceClass.POWER,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=1,
+        group=SENSOR_GROUP_CHARGING,
+        # As of the newest sample, so the state only moves with new data
+        value_fn=lambda history: history.average_power(
+            history.latest, CHARGE_AVERAGE_WINDOW.total_seconds()
+        ),
+    ),
+    TessieChargeSensorEntityDescription(
+        translation_key="charge_session_energy",
+        key="charge_history.charge_session_energy",
+        native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+        device_class=SensorDeviceClass.ENERGY,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        suggested_display_precision=2,
+        group=SENSOR_GROUP_CHARGING,
+        value_fn=lambda history: history.session_energy,
+    ),
+    TessieChargeSensorEntityDescription(
+        translation_key="peak_charger_current",
+        key="charge_history.peak_charger_current",
+        native_unit_of_measurement=UnitOfElectricCurrent.AMPERE,
+        device_class=SensorDeviceClass.CURRENT,
+        state_class=SensorStateClass.MEASUREMENT,
+        group=SENSOR_GROUP_CHARGING,
+        value_fn=lambda history: history.peak_current,
     ),
 )
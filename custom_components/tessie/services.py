@@ -1,40 +1,209 @@
 """Class to handle service logic."""
+from __future__ import annotations
 
-from tessie_api import set_charging_amps, set_temperature
-
-from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant, ServiceCall, callback
-from homeassistant.helpers import entity_registry as er
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
-
-from .const import ACCESS_TOKEN, DOMAIN
-
-
-def get_vin_from_device_id(hass: HomeAssistant, deviceId: str) -> str | None:
-    """Get vin from device."""
+import asyncio
+from collections.abc import Awaitable, Callable
+from functools import partial
+from typing import TYPE_CHECKING, Any
 
-    entReg = er.async_get(hass)
-
-    for entity in entReg.entities.values():
-        if entity.device_id == deviceId and entity.entity_id.endswith("_vin"):
-            state = hass.states.get(entity.entity_id)
-            if state is not None:
-                return state.state
+from tessie_api import set_charging_amps, set_temperature
+import voluptuous as vol
+
+from homeassistant.core import (
+    CALLBACK_TYPE,
+    Event,
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import config_validation as cv, device_registry as dr
+
+from .const import DOMAIN, SERVICE_MAX_CONCURRENCY
+from .models import DISPLAY_NAME, VehicleState
+
+if TYPE_CHECKING:
+    from .coordinator import TessieDataUpdateCoordinator
+
+SERVICE_SET_CHARGING_AMPS = "set_charging_amps"
+SERVICE_SET_CLIMATE_TEMP = "set_climate_temp"
+
+# Every service targets vehicles by device, by config entry or both
+TARGET_SCHEMA = {
+    vol.Optional("vehicle"): vol.All(cv.ensure_list, [cv.string]),
+    vol.Optional("config_entry"): cv.string,
+}
+
+SET_CHARGING_AMPS_SCHEMA = vol.All(
+    vol.Schema(
+        {
+            vol.Optional("amps"): vol.Coerce(int),
+            vol.Optional("entity_amps"): cv.entity_id,
+            **TARGET_SCHEMA,
+        }
+    ),
+    cv.has_at_least_one_key("vehicle", "config_entry"),
+)
+SET_CLIMATE_TEMP_SCHEMA = vol.All(
+    vol.Schema({vol.Optional("temp"): vol.Coerce(float), **TARGET_SCHEMA}),
+    cv.has_at_least_one_key("vehicle", "config_entry"),
+)
+
+
+class VehicleDeviceIndex:
+    """Map device ids to the VIN of the vehicle the device represents."""
+
+    def __init__(self, hass: HomeAssistant, vins: dict[str, str]) -> None:
+        """Initialize the index from the device identifier of each VIN."""
+        self._hass = hass
+        self._vins = vins
+        self._devices: dict[str, str] = {}
+
+    @classmethod
+    def from_vehicles(
+        cls, hass: HomeAssistant, vehicles: dict[str, VehicleState]
+    ) -> VehicleDeviceIndex:
+        """Create the index for the vehicles of a coordinator snapshot."""
+        return cls(hass, {car.get(DISPLAY_NAME): vin for vin, car in vehicles.items()})
+
+    @callback
+    def async_setup(self) -> CALLBACK_TYPE:
+        """Index the registered devices and follow device registry changes."""
+        dev_reg = dr.async_get(self._hass)
+        for device in dev_reg.devices.values():
+            self._async_index_device(device)
+
+        return self._hass.bus.async_listen(
+            dr.EVENT_DEVICE_REGISTRY_UPDATED, self._async_device_registry_updated
+        )
+
+    @callback
+    def _async_index_device(self, device: dr.DeviceEntry) -> None:
+        """Add the device to the index if it belongs to one of the vehicles."""
+        for domain, identifier in device.identifiers:
+            if domain == DOMAIN and identifier in self._vins:
+                self._devices[device.id] = self._vins[identifier]
+                return
+        self._devices.pop(device.id, None)
+
+    @callback
+    def _async_device_registry_updated(self, event: Event) -> None:
+        """Keep the index current when devices are created, updated or removed."""
+        device_id = event.data["device_id"]
+        if event.data["action"] == "remove":
+            self._devices.pop(device_id, None)
+        elif device := dr.async_get(self._hass).async_get(device_id):
+            self._async_index_device(device)
+
+    def get(self, device_id: str) -> str | None:
+        """Return the VIN of the vehicle behind a device."""
+        return self._devices.get(device_id)
+
+
+def get_vehicle_from_device_id(
+    hass: HomeAssistant, deviceId: str
+) -> tuple[TessieDataUpdateCoordinator, str]:
+    """Get the coordinator of the account owning a device and its vin."""
+
+    coordinator: TessieDataUpdateCoordinator
+    for coordinator in hass.data.get(DOMAIN, {}).values():
+        if (vin := coordinator.device_index.get(deviceId)) is not None:
+            return coordinator, vin
+    raise HomeAssistantError(f"Device {deviceId} is not a loaded Tessie vehicle")
+
+
+def get_target_vehicles(
+    hass: HomeAssistant, call: ServiceCall
+) -> tuple[dict[str, TessieDataUpdateCoordinator], dict[str, dict[str, Any]]]:
+    """Return the coordinator of every vehicle a service call targets, by VIN.
+
+    A call targets the vehicles of its devices and every vehicle of its
+    config entry. Devices and config entries that are not a loaded Tessie
+    vehicle or account are returned apart, as failed outcomes by their id.
+    """
+    targets: dict[str, TessieDataUpdateCoordinator] = {}
+    errors: dict[str, dict[str, Any]] = {}
+    for deviceId in cv.ensure_list(call.data.get("vehicle")):
+        try:
+            coordinator, vin = get_vehicle_from_device_id(hass, deviceId)
+        except HomeAssistantError as err:
+            errors[deviceId] = {"success": False, "error": str(err)}
+        else:
+            targets[vin] = coordinator
+
+    if (entry_id := call.data.get("config_entry")) is not None:
+        if (coordinator := hass.data.get(DOMAIN, {}).get(entry_id)) is None:
+            errors[entry_id] = {
+                "success": False,
+                "error": f"Config entry {entry_id} is not a loaded Tessie account",
+            }
+        else:
+            targets.update(dict.fromkeys(coordinator.data or {}, coordinator))
+    return targets, errors
+
+
+async def async_call_vehicles(
+    call: ServiceCall,
+    targets: dict[str, TessieDataUpdateCoordinator],
+    errors: dict[str, dict[str, Any]],
+    command: Callable[..., Awaitable[Any]],
+    *args: Any,
+) -> ServiceResponse:
+    """Send a command to every targeted vehicle, a bounded number at a time.
+
+    Returns the outcome of each vehicle, and of each target that could not
+    be resolved, when the caller asked for a response. Otherwise raises if
+    any of them failed.
+    """
+    semaphore = asyncio.Semaphore(SERVICE_MAX_CONCURRENCY)
+
+    async def _async_call(
+        vin: str, coordinator: TessieDataUpdateCoordinator
+    ) -> dict[str, Any]:
+        async with semaphore:
+            try:
+                await coordinator.async_vehicle_command(
+                    vin,
+                    partial(
+                        command, coordinator.session, vin, coordinator.token, *args
+                    ),
+                )
+            except Exception as err:  # pylint: disable=broad-except
+                return {"success": False, "error": str(err) or type(err).__name__}
+        return {"success": True}
+
+    results = errors | dict(
+        zip(
+            targets,
+            await asyncio.gather(
+                *(_async_call(vin, coordinator) for vin, coordinator in targets.items())
+            ),
+        )
+    )
+
+    if call.return_response:
+        return {"vehicles": results}
+    if failed := [vin for vin, result in results.items() if not result["success"]]:
+        raise HomeAssistantError(
+            f"{command.__name__} failed for {len(failed)} of {len(results)} "
+            f"vehicle(s): {results[failed[0]]['error']}"
+        )
     return None
 
 
 @callback
-def async_setup_services(hass: HomeAssistant, entry: ConfigEntry) -> None:
-    """Set up the asynchronous service."""
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Set up the asynchronous service once for every Tessie account."""
 
-    async def handle_set_charging_amps(call: ServiceCall):
-        deviceId = call.data.get("vehicle")
+    if hass.services.has_service(DOMAIN, SERVICE_SET_CHARGING_AMPS):
+        return
+
+    async def handle_set_charging_amps(call: ServiceCall) -> ServiceResponse:
         amps = call.data.get("amps")
         entity_amps = call.data.get("entity_amps")
 
-        if deviceId is None:
-            return
-
         if entity_amps is not None:
             if entity_amps:
                 state = hass.states.get(entity_amps)
@@ -42,30 +211,45 @@ def async_setup_services(hass: HomeAssistant, entry: ConfigEntry) -> None:
                     amps = float(state.state)
 
         if amps is None and entity_amps is None:
-            return
+            return {"vehicles": {}} if call.return_response else None
 
-        vin = get_vin_from_device_id(hass, deviceId)
-        accessToken: str = entry.data[ACCESS_TOKEN]
-        websession = async_get_clientsession(hass)
+        return await async_call_vehicles(
+            call, *get_target_vehicles(hass, call), set_charging_amps, amps
+        )
 
-        await set_charging_amps(websession, vin, accessToken, amps)
-
-    async def handle_set_climate_temp(call: ServiceCall):
-        deviceId = call.data.get("vehicle")
+    async def handle_set_climate_temp(call: ServiceCall) -> ServiceResponse:
         temp = call.data.get("temp")
 
-        if deviceId is None:
-            return
-
         if temp is None:
-            return
+            return {"vehicles": {}} if call.return_response else None
 
-        vin = get_vin_from_device_id(hass, deviceId)
-        accessToken: str = entry.data[ACCESS_TOKEN]
-        websession = async_get_clientsession(hass)
-
-        await set_temperature(websession, vin, accessToken, temp)
+        return await async_call_vehicles(
+            call, *get_target_vehicles(hass, call), set_temperature, temp
+        )
 
     # Register services with home assistant
-    hass.services.async_register(DOMAIN, "set_charging_amps", handle_set_charging_amps)
-    hass.services.async_register(DOMAIN, "set_climate_temp", handle_set_climate_temp)
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_SET_CHARGING_AMPS,
+        handle_set_charging_amps,
+        schema=SET_CHARGING_AMPS_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_SET_CLIMATE_TEMP,
+        handle_set_climate_temp,
+        schema=SET_CLIMATE_TEMP_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+
+@callback
+def async_unload_services(hass: HomeAssistant) -> None:
+    """Remove the services once the last Tessie account is unloaded."""
+
+    if hass.data.get(DOMAIN):
+        return
+
+    hass.services.async_remove(DOMAIN, SERVICE_SET_CHARGING_AMPS)
+    hass.services.async_remove(DOMAIN, SERVICE_SET_CLIMATE_TEMP)
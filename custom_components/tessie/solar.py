@@ -0,0 +1,225 @@
+"""Charge current of a vehicle following a solar power or current entity."""
+from __future__ import annotations
+
+from functools import partial
+import logging
+from math import floor
+from time import monotonic
+from typing import TYPE_CHECKING, Any
+
+from tessie_api import set_charging_amps
+
+from homeassistant.const import (
+    STATE_UNAVAILABLE,
+    STATE_UNKNOWN,
+    UnitOfElectricCurrent,
+    UnitOfPower,
+)
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later, async_track_state_change_event
+from homeassistant.util.unit_conversion import PowerConverter
+
+from .helpers import compile_key_path
+from .scheduler import CHARGING_STATE
+
+if TYPE_CHECKING:
+    from .coordinator import TessieDataUpdateCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+CHARGE_CURRENT_REQUEST = compile_key_path(
+    "last_state.charge_state.charge_current_request"
+)
+CHARGE_CURRENT_REQUEST_MAX = compile_key_path(
+    "last_state.charge_state.charge_current_request_max"
+)
+CHARGER_VOLTAGE = compile_key_path("last_state.charge_state.charger_voltage")
+CHARGER_PHASES = compile_key_path("last_state.charge_state.charger_phases")
+
+# Key paths the controller reads, kept in every vehicle record
+SOLAR_KEY_PATHS = (
+    CHARGE_CURRENT_REQUEST,
+    CHARGE_CURRENT_REQUEST_MAX,
+    CHARGER_VOLTAGE,
+    CHARGER_PHASES,
+)
+
+# Lowest charge current a vehicle accepts
+MIN_CHARGING_AMPS = 5
+
+
+def quantize_amps(amps: float, step: int, minimum: int, maximum: int) -> int:
+    """Round a current down to a multiple of step within minimum and maximum."""
+    amps = floor(amps / step) * step
+    return int(min(max(amps, minimum), maximum))
+
+
+class SolarChargeController:
+    """Set the charge current of one vehicle from the state of an entity.
+
+    The entity reports the power or current available to the vehicle, and a
+    power is turned into a current with the voltage and phases the vehicle
+    charges at. The vehicle is only commanded while it is charging, and only
+    when the available current moved away from the requested one by more
+    than the hysteresis and rounds to another step. Commands are at least
+    dwell seconds apart; changes arriving sooner are applied when the dwell
+    ends.
+    """
+
+    def __init__(
+        self,
+        coordinator: TessieDataUpdateCoordinator,
+        vin: str,
+        entity_id: str,
+        hysteresis: float,
+        dwell: float,
+        step: int,
+    ) -> None:
+        """Initialize the controller."""
+        self._coordinator = coordinator
+        self._hass: HomeAssistant = coordinator.hass
+        self._vin = vin
+        self._entity_id = entity_id
+        self._hysteresis = hysteresis
+        self._dwell = dwell
+        self._step = step
+        self._last_command: float | None = None
+        self._sending = False
+        self._pending = False
+        self._unsub_dwell: CALLBACK_TYPE | None = None
+        self.commands = 0
+
+    @callback
+    def async_setup(self) -> CALLBACK_TYPE:
+        """Follow the entity and the charging state of the vehicle."""
+        unsubs = [
+            async_track_state_change_event(
+                self._hass, self._entity_id, self._async_state_changed
+            ),
+            self._coordinator.async_add_listener(
+                self._async_evaluate, (self._vin, CHARGING_STATE)
+            ),
+        ]
+
+        @callback
+        def _async_unsub() -> None:
+            for unsub in unsubs:
+                unsub()
+            self._async_cancel_dwell()
+
+        self._async_evaluate()
+        return _async_unsub
+
+    @callback
+    def _async_state_changed(self, event: Event) -> None:
+        """Re-evaluate the charge current when the entity changes."""
+        self._async_evaluate()
+
+    def _available_amps(self, car_voltage: Any, car_phases: Any) -> float | None:
+        """Return the current the entity makes available to the vehicle."""
+        state = self._hass.states.get(self._entity_id)
+        if state is None or state.state in (STATE_UNAVAILABLE, STATE_UNKNOWN):
+            return None
+        try:
+            value = float(state.state)
+        except ValueError:
+            return None
+
+        unit = state.attributes.get("unit_of_measurement")
+        if unit == UnitOfElectricCurrent.AMPERE:
+            return value
+        if unit not in PowerConverter.VALID_UNITS or not car_voltage:
+            _LOGGER.debug("Cannot derive a current from %s", self._entity_id)
+            return None
+        watts = PowerConverter.convert(value, unit, UnitOfPower.WATT)
+        return watts / (car_voltage * (car_phases or 1))
+
+    @callback
+    def _async_evaluate(self) -> None:
+        """Command a new charge current if the available one moved enough."""
+        coordinator = self._coordinator
+        vin = self._vin
+        if self._sending:
+            self._pending = True
+            return
+        if coordinator.get_value(vin, CHARGING_STATE) != "Charging":
+            return
+        if (
+            available := self._available_amps(
+                coordinator.get_value(vin, CHARGER_VOLTAGE),
+                coordinator.get_value(vin, CHARGER_PHASES),
+            )
+        ) is None:
+            return
+
+        requested = coordinator.get_value(vin, CHARGE_CURRENT_REQUEST)
+        if requested is not None and abs(available - requested) < self._hysteresis:
+            return
+        maximum = coordinator.get_value(vin, CHARGE_CURRENT_REQUEST_MAX)
+        target = quantize_amps(
+            available, self._step, MIN_CHARGING_AMPS, maximum or MIN_CHARGING_AMPS
+        )
+        if target == requested:
+            return
+
+        now = monotonic()
+        if (
+            self._last_command is not None
+            and (wait := self._last_command + self._dwell - now) > 0
+        ):
+            if self._unsub_dwell is None:
+                self._unsub_dwell = async_call_later(
+                    self._hass, wait, self._async_dwell_ended
+                )
+            return
+
+        self._last_command = now
+        self._sending = True
+        self._hass.async_create_background_task(
+            self._async_send(target), f"tessie solar charging amps {vin}"
+        )
+
+    @callback
+    def _async_dwell_ended(self, _now: Any) -> None:
+        """Apply the changes that arrived during the dwell."""
+        self._unsub_dwell = None
+        self._async_evaluate()
+
+    @callback
+    def _async_cancel_dwell(self) -> None:
+        """Cancel the pending evaluation at the end of the dwell."""
+        if self._unsub_dwell is not None:
+            self._unsub_dwell()
+            self._unsub_dwell = None
+
+    async def _async_send(self, amps: int) -> None:
+        """Send the charge current, showing it as requested once it was set."""
+        coordinator = self._coordinator
+        _LOGGER.debug(
+            "Following %s, charging %s at %s A", self._entity_id, self._vin, amps
+        )
+        try:
+            await coordinator.async_vehicle_command(
+                self._vin,
+                partial(
+                    set_charging_amps,
+                    coordinator.session,
+                    self._vin,
+                    coordinator.token,
+                    amps,
+                ),
+            )
+        except Exception as err:  # pylint: disable=broad-except
+            _LOGGER.warning(
+                "Setting the charge current of %s failed: %s", self._vin, err
+            )
+        else:
+            self.commands += 1
+            coordinator.async_set_optimistic_value(
+                self._vin, CHARGE_CURRENT_REQUEST, amps
+            )
+        finally:
+            self._sending = False
+        if self._pending:
+            self._pending = False
+            self._async_evaluate()
@@ -0,0 +1,191 @@
+"""Streaming telemetry from Tessie, applied on top of the polled state.
+
+Tessie relays the Tesla fleet telemetry of each vehicle over a websocket.
+Every message carries a list of changed fields:
+
+    {"vin": "...", "createdAt": "...",
+     "data": [{"key": "BatteryLevel", "value": {"doubleValue": 80.5}}, ...]}
+
+The fields the integration tracks are mapped onto their polled key paths
+and applied to the vehicle record as they arrive.
+"""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+import json
+import logging
+import random
+from typing import TYPE_CHECKING, Any
+
+from aiohttp import ClientError, WSMsgType
+
+from .const import (
+    STREAM_HEARTBEAT,
+    STREAM_RECONNECT_DELAY,
+    STREAM_RECONNECT_DELAY_MAX,
+)
+from .governor import RequestPriority
+from .helpers import KeyPath, compile_key_path
+
+if TYPE_CHECKING:
+    from .coordinator import TessieDataUpdateCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+STREAMING_URL = "wss://streaming.tessie.com"
+
+
+def _integer(value: Any) -> int:
+    """Decode a whole number, which may be streamed as a double."""
+    return round(float(value))
+
+
+def _number(value: Any) -> float:
+    """Decode a number."""
+    return float(value)
+
+
+def _boolean(value: Any) -> bool:
+    """Decode a boolean, which may be streamed as a string."""
+    if isinstance(value, str):
+        return value.lower() == "true"
+    return bool(value)
+
+
+def _enum(prefix: str) -> Callable[[Any], str]:
+    """Decode an enum value by dropping the prefix of its type name."""
+
+    def _decode(value: Any) -> str:
+        value = str(value)
+        return value[len(prefix) :] if value.startswith(prefix) else value
+
+    return _decode
+
+
+def _sentry_mode(value: Any) -> bool:
+    """Decode the sentry mode state into whether sentry mode is on."""
+    return str(value) not in ("SentryModeStateOff", "Off", "false")
+
+
+def _charge_state(prefix: str) -> Callable[[Any], str]:
+    """Decode the detailed charge state into the polled charging state."""
+    decode = _enum(prefix)
+
+    def _decode(value: Any) -> str:
+        return {"Enable": "Starting"}.get(state := decode(value), state)
+
+    return _decode
+
+
+def _field(path: str, decode: Callable[[Any], Any]) -> tuple[KeyPath, Callable]:
+    """Return the key path and decoder of a streamed field."""
+    return compile_key_path(f"last_state.{path}"), decode
+
+
+# Streamed field name to the polled key path it updates and its decoder
+FIELDS: dict[str, tuple[KeyPath, Callable[[Any], Any]]] = {
+    "BatteryLevel": _field("charge_state.battery_level", _integer),
+    "ChargeLimitSoc": _field("charge_state.charge_limit_soc", _integer),
+    "ChargeAmps": _field("charge_state.charge_amps", _integer),
+    "ChargeCurrentRequest": _field("charge_state.charge_current_request", _integer),
+    "ChargeCurrentRequestMax": _field(
+        "charge_state.charge_current_request_max", _integer
+    ),
+    "ChargerPhases": _field("charge_state.charger_phases", _integer),
+    "ChargerVoltage": _field("charge_state.charger_voltage", _integer),
+    "ACChargingPower": _field("charge_state.charger_power", _integer),
+    "ACChargingEnergyIn": _field("charge_state.charge_energy_added", _number),
+    "EstBatteryRange": _field("charge_state.est_battery_range", _number),
+    "IdealBatteryRange": _field("charge_state.ideal_battery_range", _number),
+    "RatedRange": _field("charge_state.battery_range", _number),
+    "TimeToFullCharge": _field("charge_state.time_to_full_charge", _number),
+    "ChargePortDoorOpen": _field("charge_state.charge_port_door_open", _boolean),
+    "ChargePortLatch": _field(
+        "charge_state.charge_port_latch", _enum("ChargePortLatch")
+    ),
+    "DetailedChargeState": _field(
+        "charge_state.charging_state", _charge_state("DetailedChargeState")
+    ),
+    "FastChargerPresent": _field("charge_state.fast_charger_present", _boolean),
+    "BatteryHeaterOn": _field("charge_state.battery_heater_on", _boolean),
+    "ScheduledChargingPending": _field(
+        "charge_state.scheduled_charging_pending", _boolean
+    ),
+    "Gear": _field("drive_state.shift_state", _enum("ShiftState")),
+    "Locked": _field("vehicle_state.locked", _boolean),
+    "SentryMode": _field("vehicle_state.sentry_mode", _sentry_mode),
+    "ValetModeEnabled": _field("vehicle_state.valet_mode", _boolean),
+}
+
+
+def parse_message(message: dict[str, Any]) -> dict[KeyPath, Any]:
+    """Return the key path updates carried by a telemetry message."""
+    updates: dict[KeyPath, Any] = {}
+    for datum in message.get("data", ()):
+        if (field := FIELDS.get(datum.get("key"))) is None:
+            continue
+        key_path, decode = field
+        value = datum.get("value") or {}
+        if value.get("invalid") or not value:
+            updates[key_path] = None
+            continue
+        try:
+            updates[key_path] = decode(next(iter(value.values())))
+        except (TypeError, ValueError):
+            _LOGGER.debug("Ignoring undecodable %s value %s", datum["key"], value)
+    return updates
+
+
+class VehicleStream:
+    """Websocket streaming the telemetry of one vehicle into the coordinator."""
+
+    def __init__(self, coordinator: TessieDataUpdateCoordinator, vin: str) -> None:
+        """Initialize the stream."""
+        self._coordinator = coordinator
+        self._vin = vin
+        self._connected = False
+
+    async def async_run(self) -> None:
+        """Stay connected, reconnecting with jittered backoff on failures.
+
+        While disconnected the vehicle falls back to its regular polling, and
+        a refresh catches up on what was missed after a connection drops.
+        """
+        delay = STREAM_RECONNECT_DELAY
+        while True:
+            try:
+                await self._async_stream()
+            except (ClientError, TimeoutError) as err:
+                _LOGGER.debug("Streaming %s failed: %s", self._vin, err)
+            if self._connected:
+                self._connected = False
+                delay = STREAM_RECONNECT_DELAY
+                await self._coordinator.async_request_refresh()
+            await asyncio.sleep(random.uniform(delay / 2, delay))
+            delay = min(delay * 2, STREAM_RECONNECT_DELAY_MAX)
+
+    async def _async_stream(self) -> None:
+        """Apply the messages of one connection until it closes."""
+        coordinator = self._coordinator
+        await coordinator.governor.async_acquire(RequestPriority.POLL)
+        async with coordinator.session.ws_connect(
+            f"{STREAMING_URL}/{self._vin}",
+            params={"access_token": coordinator.token},
+            heartbeat=STREAM_HEARTBEAT,
+        ) as websocket:
+            _LOGGER.debug("Streaming %s", self._vin)
+            self._connected = True
+            coordinator.async_set_streaming(self._vin, True)
+            try:
+                async for message in websocket:
+                    if message.type is not WSMsgType.TEXT:
+                        break
+                    try:
+                        updates = parse_message(json.loads(message.data))
+                    except (AttributeError, ValueError):
+                        _LOGGER.debug("Ignoring malformed message from %s", self._vin)
+                        continue
+                    coordinator.async_apply_stream_update(self._vin, updates)
+            finally:
+                coordinator.async_set_streaming(self._vin, False)
@@ -1,7 +1,9 @@
 """Switch for performing actions against Tesla."""
 
 from abc import ABC, abstractmethod
-from typing import Any
+from collections.abc import Awaitable, Callable
+from functools import partial
+from typing import Any, NamedTuple
 
 from aiohttp import ClientSession
 from tessie_api import (
@@ -24,51 +26,15 @@ from tessie_api import (
 from homeassistant.components.switch import SwitchEntity
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from . import ACCESS_TOKEN, DOMAIN, MANUFACTURER, TessieDataUpdateCoordinator
-
-
-def traverse_nested_dict(data_dict, key_path):
-    """Get a value by a dot notation."""
-
-    keys = key_path.split(".")
-    value = data_dict
-    for key in keys:
-        value = value.get(key)
-        if value is None:
-            return None
-    return value
-
-
-def set_nested_dict_value(data_dict, key_path, value):
-    """Set a value in a nested dictionary using a dot notation key path."""
-
-    keys = key_path.split(".")
-    for key in keys[:-1]:  # Go until the second last key
-        data_dict = data_dict.setdefault(
-            key, {}
-        )  # Get the dict, or create an empty one if the key doesn't exist
-    data_dict[keys[-1]] = value  # Set the value for the last key
-
-
-def set_vehicle_charging_state(coordinator, vin, key, value):
-    """Set the charging state for a vehicle by its VIN."""
-    for vehicle in coordinator.data["results"]:
-        if vehicle["vin"] == vin:
-            set_nested_dict_value(vehicle, key, value)
-            break
-
-
-def getCarByVin(coordinator, vin: str) -> Any:
-    """Retrieve the car by VIN."""
-    for car in coordinator.data["results"]:
-        if car["vin"] == vin:
-            return car
-    return None
+from .commands import CommandOutcome
+from .const import DOMAIN, MANUFACTURER
+from .coordinator import TessieDataUpdateCoordinator
+from .helpers import compile_key_path
+from .models import CAR_TYPE, DISPLAY_NAME
 
 
 async def async_setup_entry(
@@ -78,110 +44,25 @@ async def async_setup_entry(
 ) -> None:
     """Create the switches for the Ring devices."""
     coordinator: TessieDataUpdateCoordinator = hass.data[DOMAIN][config_entry.entry_id]
-    cars = coordinator.data["results"]
-    session = async_get_clientsession(hass)
-
-    switches: list[TessieSwitchBase] = []
-    for car in cars:
-        switches.append(
-            TessieChargerSwitch(
-                coordinator,
-                session,
-                "last_state.charge_state.charging_state",
-                "charging_state_switch",
-                car["last_state"]["display_name"],
-                car["last_state"]["vehicle_config"]["car_type"],
-                config_entry.data[ACCESS_TOKEN],
-                "Charging",
-                "Stopped",
-                car["vin"],
-            )
-        )
-
-        switches.append(
-            TessieChargePortSwitch(
-                coordinator,
-                session,
-                "last_state.charge_state.charge_port_door_open",
-                "charge_port_door_open_switch",
-                car["last_state"]["display_name"],
-                car["last_state"]["vehicle_config"]["car_type"],
-                config_entry.data[ACCESS_TOKEN],
-                True,
-                False,
-                car["vin"],
-            )
-        )
-        switches.append(
-            TessieClimateSwitch(
-                coordinator,
-                session,
-                "last_state.climate_state.is_climate_on",
-                "is_climate_on_switch",
-                car["last_state"]["display_name"],
-                car["last_state"]["vehicle_config"]["car_type"],
-                config_entry.data[ACCESS_TOKEN],
-                True,
-                False,
-                car["vin"],
-            )
-        )
-        switches.append(
-            TessieSteeringWheelHeatSwitch(
-                coordinator,
-                session,
-                "last_state.climate_state.steering_wheel_heater",
-                "steering_wheel_heater_switch",
-                car["last_state"]["display_name"],
-                car["last_state"]["vehicle_config"]["car_type"],
-                config_entry.data[ACCESS_TOKEN],
-                True,
-                False,
-                car["vin"],
-            )
-        )
-        switches.append(
-            TessieLockSwitch(
-                coordinator,
-                session,
-                "last_state.vehicle_state.locked",
-                "locked_switch",
-                car["last_state"]["display_name"],
-                car["last_state"]["vehicle_config"]["car_type"],
-                config_entry.data[ACCESS_TOKEN],
-                True,
-                False,
-                car["vin"],
-            )
-        )
-        switches.append(
-            TessieSentryModeSwitch(
-                coordinator,
-                session,
-                "last_state.vehicle_state.sentry_mode",
-                "sentry_mode_switch",
-                car["last_state"]["display_name"],
-                car["last_state"]["vehicle_config"]["car_type"],
-                config_entry.data[ACCESS_TOKEN],
-                True,
-                False,
-                car["vin"],
-            )
-        )
-        switches.append(
-            TessieValetModeSwitch(
-                coordinator,
-                session,
-                "last_state.vehicle_state.valet_mode",
-                "valet_mode_switch",
-                car["last_state"]["display_name"],
-                car["last_state"]["vehicle_config"]["car_type"],
-                config_entry.data[ACCESS_TOKEN],
-                True,
-                False,
-                car["vin"],
-            )
+    cars = coordinator.data.values()
+    session = coordinator.session
+
+    switches: list[TessieSwitchBase] = [
+        switch_type.cls(
+            coordinator,
+            session,
+            switch_type.key,
+            switch_type.translation_key,
+            car.get(DISPLAY_NAME),
+            car.get(CAR_TYPE),
+            coordinator.token,
+            switch_type.on_value,
+            switch_type.off_value,
+            car.vin,
         )
+        for car in cars
+        for switch_type in SWITCH_TYPES
+    ]
 
     async_add_entities(switches)
 
@@ -205,10 +86,12 @@ class TessieSwitchBase(CoordinatorEntity, SwitchEntity, ABC):
         vin: str,
     ) -> None:
         """Initialize the Tessie switch."""
-        super().__init__(coordinator)
+        key_path = compile_key_path(key)
+        super().__init__(coordinator, (vin, key_path))
         self._session = session
         self._apiKey = apiKey
         self._key = key
+        self._key_path = key_path
         self._name = name
         self._translation_key = translation_key
         self._model = model
@@ -239,10 +122,19 @@ class TessieSwitchBase(CoordinatorEntity, SwitchEntity, ABC):
     @property
     def is_on(self) -> bool:
         """Return whether the switch is on."""
-        value = traverse_nested_dict(
-            getCarByVin(self.coordinator, self._vin), self._key
+        return self.coordinator.get_value(self._vin, self._key_path) == self._on_value
+
+    async def _async_send_command(
+        self, value: str | bool, command: Callable[[], Awaitable[Any]]
+    ) -> None:
+        """Queue the command and apply its value once it has been sent."""
+        outcome = await self.coordinator.async_queue_command(
+            self._vin, self._key_path, value, command
         )
-        return value == self._on_value
+        if outcome is CommandOutcome.EXECUTED:
+            self.coordinator.async_set_optimistic_value(
+                self._vin, self._key_path, value
+            )
 
     @abstractmethod
     async def async_turn_on(self, **kwargs: Any) -> None:
@@ -258,19 +150,17 @@ class TessieChargerSwitch(TessieSwitchBase):
 
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Turn on the switch."""
-        await start_charging(self._session, self._vin, self._apiKey)
-        set_vehicle_charging_state(
-            self.coordinator, self._vin, self._key, self._on_value
+        await self._async_send_command(
+            self._on_value,
+            partial(start_charging, self._session, self._vin, self._apiKey),
         )
-        self.async_write_ha_state()
 
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Turn off the switch."""
-        await stop_charging(self._session, self._vin, self._apiKey)
-        set_vehicle_charging_state(
-            self.coordinator, self._vin, self._key, self._off_value
+        await self._async_send_command(
+            self._off_value,
+            partial(stop_charging, self._session, self._vin, self._apiKey),
         )
-        self.async_write_ha_state()
 
 
 class TessieChargePortSwitch(TessieSwitchBase):
@@ -278,19 +168,17 @@ class TessieChargePortSwitch(TessieSwitchBase):
 
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Turn on the switch."""
-        await open_unlock_charge_port(self._session, self._vin, self._apiKey)
-        set_vehicle_charging_state(
-            self.coordinator, self._vin, self._key, self._on_value
+        await self._async_send_command(
+            self._on_value,
+            partial(open_unlock_charge_port, self._session, self._vin, self._apiKey),
         )
-        self.async_write_ha_state()
 
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Turn off the switch."""
-        await close_charge_port(self._session, self._vin, self._apiKey)
-        set_vehicle_charging_state(
-            self.coordinator, self._vin, self._key, self._off_value
+        await self._async_send_command(
+            self._off_value,
+            partial(close_charge_port, self._session, self._vin, self._apiKey),
         )
-        self.async_write_ha_state()
 
 
 class TessieClimateSwitch(TessieSwitchBase):
@@ -298,19 +186,19 @@ class TessieClimateSwitch(TessieSwitchBase):
 
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Turn on the switch."""
-        await start_climate_preconditioning(self._session, self._vin, self._apiKey)
-        set_vehicle_charging_state(
-            self.coordinator, self._vin, self._key, self._on_value
+        await self._async_send_command(
+            self._on_value,
+            partial(
+                start_climate_preconditioning, self._session, self._vin, self._apiKey
+            ),
         )
-        self.async_write_ha_state()
 
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Turn off the switch."""
-        await stop_climate(self._session, self._vin, self._apiKey)
-        set_vehicle_charging_state(
-            self.coordinator, self._vin, self._key, self._off_value
+        await self._async_send_command(
+            self._off_value,
+            partial(stop_climate, self._session, self._vin, self._apiKey),
         )
-        self.async_write_ha_state()
 
 
 class TessieSteeringWheelHeatSwitch(TessieSwitchBase):
@@ -318,19 +206,19 @@ class TessieSteeringWheelHeatSwitch(TessieSwitchBase):
 
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Turn on the switch."""
-        await start_steering_wheel_heater(self._session, self._vin, self._apiKey)
-        set_vehicle_charging_state(
-            self.coordinator, self._vin, self._key, self._on_value
+        await self._async_send_command(
+            self._on_value,
+            partial(
+                start_steering_wheel_heater, self._session, self._vin, self._apiKey
+            ),
         )
-        self.async_write_ha_state()
 
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Turn off the switch."""
-        await stop_steering_wheel_heater(self._session, self._vin, self._apiKey)
-        set_vehicle_charging_state(
-            self.coordinator, self._vin, self._key, self._off_value
+        await self._async_send_command(
+            self._off_value,
+            partial(stop_steering_wheel_heater, self._session, self._vin, self._apiKey),
         )
-        self.async_write_ha_state()
 
 
 class TessieLockSwitch(TessieSwitchBase):
@@ -338,19 +226,17 @@ class TessieLockSwitch(TessieSwitchBase):
 
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Turn on the switch."""
-        await lock(self._session, self._vin, self._apiKey)
-        set_vehicle_charging_state(
-            self.coordinator, self._vin, self._key, self._on_value
+        await self._async_send_command(
+            self._on_value,
+            partial(lock, self._session, self._vin, self._apiKey),
         )
-        self.async_write_ha_state()
 
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Turn off the switch."""
-        await unlock(self._session, self._vin, self._apiKey)
-        set_vehicle_charging_state(
-            self.coordinator, self._vin, self._key, self._off_value
+        await self._async_send_command(
+            self._off_value,
+            partial(unlock, self._session, self._vin, self._apiKey),
         )
-        self.async_write_ha_state()
 
 
 class TessieSentryModeSwitch(TessieSwitchBase):
@@ -358,19 +244,17 @@ class TessieSentryModeSwitch(TessieSwitchBase):
 
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Turn on the switch."""
-        await enable_sentry_mode(self._session, self._vin, self._apiKey)
-        set_vehicle_charging_state(
-            self.coordinator, self._vin, self._key, self._on_value
+        await self._async_send_command(
+            self._on_value,
+            partial(enable_sentry_mode, self._session, self._vin, self._apiKey),
         )
-        self.async_write_ha_state()
 
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Turn off the switch."""
-        await disable_sentry_mode(self._session, self._vin, self._apiKey)
-        set_vehicle_charging_state(
-            self.coordinator, self._vin, self._key, self._off_value
+        await self._async_send_command(
+            self._off_value,
+            partial(disable_sentry_mode, self._session, self._vin, self._apiKey),
         )
-        self.async_write_ha_state()
 
 
 class TessieValetModeSwitch(TessieSwitchBase):
@@ -378,16 +262,77 @@ class TessieValetModeSwitch(TessieSwitchBase):
 
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Turn on the switch."""
-        await enable_valet_mode(self._session, self._vin, self._apiKey)
-        set_vehicle_charging_state(
-            self.coordinator, self._vin, self._key, self._on_value
+        await self._async_send_command(
+            self._on_value,
+            partial(enable_valet_mode, self._session, self._vin, self._apiKey),
         )
-        self.async_write_ha_state()
 
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Turn off the switch."""
-        await disable_valet_mode(self._session, self._vin, self._apiKey)
-        set_vehicle_charging_state(
-            self.coordinator, self._vin, self._key, self._off_value
+        await self._async_send_command(
+            self._off_value,
+            partial(disable_valet_mode, self._session, self._vin, self._apiKey),
         )
-        self.async_write_ha_state()
+
+
+class TessieSwitchType(NamedTuple):
+    """The switch class, key and on/off values of one switch of a car."""
+
+    cls: type[TessieSwitchBase]
+    key: str
+    translation_key: str
+    on_value: str | bool
+    off_value: str | bool
+
+
+SWITCH_TYPES: tuple[TessieSwitchType, ...] = (
+    TessieSwitchType(
+        TessieChargerSwitch,
+        "last_state.charge_state.charging_state",
+        "charging_state_switch",
+        "Charging",
+        "Stopped",
+    ),
+    TessieSwitchType(
+        TessieChargePortSwitch,
+        "last_state.charge_state.charge_port_door_open",
+        "charge_port_door_open_switch",
+        True,
+        False,
+    ),
+    TessieSwitchType(
+        TessieClimateSwitch,
+        "last_state.climate_state.is_climate_on",
+        "is_climate_on_switch",
+        True,
+        False,
+    ),
+    TessieSwitchType(
+        TessieSteeringWheelHeatSwitch,
+        "last_state.climate_state.steering_wheel_heater",
+        "steering_wheel_heater_switch",
+        True,
+        False,
+    ),
+    TessieSwitchType(
+        TessieLockSwitch,
+        "last_state.vehicle_state.locked",
+        "locked_switch",
+        True,
+        False,
+    ),
+    TessieSwitchType(
+        TessieSentryModeSwitch,
+        "last_state.vehicle_state.sentry_mode",
+        "sentry_mode_switch",
+        True,
+        False,
+    ),
+    TessieSwitchType(
+        TessieValetModeSwitch,
+        "last_state.vehicle_state.valet_mode",
+        "valet_mode_switch",
+        True,
+        False,
+    ),
+)
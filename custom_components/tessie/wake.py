@@ -0,0 +1,65 @@
+"""Shared wake up of a sleeping vehicle for the commands sent to it."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+import logging
+from typing import Any, TypeVar
+
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+
+_LOGGER = logging.getLogger(__name__)
+
+_T = TypeVar("_T")
+
+
+class VehicleWakeManager:
+    """Wake one vehicle once for every command waiting on it.
+
+    A command to a vehicle the coordinator last saw asleep starts a single
+    wake request, and commands arriving meanwhile wait on that same wake.
+    Once the vehicle is awake the commands run back-to-back, one at a time.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        vin: str,
+        is_asleep: Callable[[], bool],
+        wake: Callable[[], Awaitable[dict[str, Any]]],
+        on_awake: Callable[[], None],
+    ) -> None:
+        """Initialize the manager."""
+        self._hass = hass
+        self._vin = vin
+        self._is_asleep = is_asleep
+        self._wake = wake
+        self._on_awake = on_awake
+        self._waking: asyncio.Task[None] | None = None
+        self._lock = asyncio.Lock()
+        self.wakes = 0
+
+    async def async_run(self, call: Callable[[], Awaitable[_T]]) -> _T:
+        """Run a command once the vehicle is awake and the previous one is done."""
+        if self._waking is None and self._is_asleep():
+            self._waking = self._hass.async_create_task(
+                self._async_wake(), f"tessie wake {self._vin}"
+            )
+        if self._waking is not None:
+            # Shielded so a cancelled command does not cancel the shared wake
+            await asyncio.shield(self._waking)
+        async with self._lock:
+            return await call()
+
+    async def _async_wake(self) -> None:
+        """Wake the vehicle, raising if it did not wake up."""
+        _LOGGER.debug("Waking %s before sending commands", self._vin)
+        try:
+            result = await self._wake()
+            if not result.get("result"):
+                raise HomeAssistantError(f"Vehicle {self._vin} did not wake up")
+            self.wakes += 1
+            self._on_awake()
+        finally:
+            self._waking = None
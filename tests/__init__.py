@@ -0,0 +1 @@
+"""Tests for the Tessie integration."""
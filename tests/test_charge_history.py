@@ -0,0 +1,100 @@
+"""Tests for the ring buffer of charge samples."""
+from __future__ import annotations
+
+import pytest
+
+from custom_components.tessie.charge_history import (
+    CHARGE_HISTORY_KEY_PATHS,
+    ChargeHistory,
+)
+from custom_components.tessie.models import VehicleSchema, VehicleState
+
+SCHEMA = VehicleSchema(CHARGE_HISTORY_KEY_PATHS)
+
+
+def _car(
+    power: float | None, current: float = 16, state: str = "Charging"
+) -> VehicleState:
+    """Return a vehicle record with the given charge metrics."""
+    return SCHEMA.project(
+        {
+            "vin": "VIN",
+            "last_state": {
+                "charge_state": {
+                    "charging_state": state,
+                    "charger_power": power,
+                    "charger_actual_current": current,
+                }
+            },
+        }
+    )
+
+
+def _history(*samples: tuple[float, float], size: int = 8) -> ChargeHistory:
+    """Return a buffer holding (time, power) samples."""
+    history = ChargeHistory(size)
+    for now, power in samples:
+        assert history.record(now, _car(power))
+    return history
+
+
+def test_record_rejects_missing_and_old_samples() -> None:
+    """Test that samples without power or not newer than the last are skipped."""
+    history = ChargeHistory(4)
+    assert not history.record(10.0, _car(None))
+    assert history.record(10.0, _car(7))
+    assert not history.record(10.0, _car(8))
+    assert not history.record(5.0, _car(8))
+    assert history.count == 1
+    assert history.latest == 10.0
+
+
+def test_wraps_around() -> None:
+    """Test that the oldest samples are overwritten once the buffer is full."""
+    history = _history(*((float(n), float(n)) for n in range(10)), size=4)
+    assert history.count == 4
+    assert history.latest == 9.0
+    assert list(history._ordered(history.times)) == [6.0, 7.0, 8.0, 9.0]
+
+
+def test_session_energy_and_peak_current() -> None:
+    """Test the accumulated energy and peak current of a session."""
+    history = ChargeHistory(2)
+    history.record(0.0, _car(10, current=16))
+    history.record(1800.0, _car(10, current=32))
+    history.record(3600.0, _car(20, current=24))
+    # The session outlives the samples held in the buffer
+    assert history.session_energy == pytest.approx(5 + 7.5)
+    assert history.peak_current == 32
+
+    history.record(3700.0, _car(0, current=0, state="Stopped"))
+    history.record(3800.0, _car(11, current=16))
+    assert history.session_energy == 0.0
+    assert history.peak_current == 16
+
+
+def test_average_power_empty() -> None:
+    """Test the average without samples."""
+    assert ChargeHistory(4).average_power(100.0, 60.0) is None
+
+
+def test_average_power_holds_before_window() -> None:
+    """Test that the newest sample is held when all samples are older."""
+    history = _history((0.0, 4.0), (10.0, 6.0))
+    assert history.average_power(1000.0, 60.0) == pytest.approx(6.0)
+
+
+def test_average_power_interpolates_window_start() -> None:
+    """Test a window that starts between two samples."""
+    history = _history((0.0, 0.0), (100.0, 10.0), (200.0, 10.0))
+    # The power ramps to 5 at the window start, then to and at 10
+    expected = ((5 + 10) / 2 * 50 + 10 * 100) / 150
+    assert history.average_power(200.0, 150.0) == pytest.approx(expected)
+
+
+def test_average_power_holds_newest_until_now() -> None:
+    """Test that the newest sample applies until now."""
+    history = _history((0.0, 10.0), (100.0, 20.0))
+    expected = ((10 + 20) / 2 * 100 + 20 * 100) / 200
+    assert history.average_power(200.0, 300.0) == pytest.approx(expected)
+    assert history.average_power(history.latest, 50.0) == pytest.approx((15 + 20) / 2)
@@ -0,0 +1,119 @@
+"""Tests for the backfill of past charges and drives."""
+from __future__ import annotations
+
+import asyncio
+from datetime import timedelta
+from typing import Any
+from unittest.mock import patch
+
+from custom_components.tessie import history
+from custom_components.tessie.history import HISTORY_KINDS, HistoryImporter
+
+HOUR = 3600
+START = 1_700_000_000 // HOUR * HOUR
+CHARGES = HISTORY_KINDS[0]
+
+
+class _Coordinator:
+    """Coordinator stand-in passing requests straight through."""
+
+    hass = None
+    session = None
+    token = "token"
+
+    def get_vehicle(self, vin: str) -> None:
+        """Return no vehicle, so statistics are named after the VIN."""
+
+    async def async_api_call(self, call: Any, *args: Any) -> Any:
+        """Make the request right away."""
+        return await call()
+
+
+class _Store:
+    """Store stand-in keeping the saved data."""
+
+    def __init__(self) -> None:
+        self.saved: Any = None
+
+    async def async_save(self, data: Any) -> None:
+        self.saved = data
+
+
+def _import(records: list[dict[str, Any]]) -> tuple[dict[str, list[Any]], Any]:
+    """Backfill two hourly pages of records and return the rows per statistic."""
+    rows: dict[str, list[Any]] = {}
+
+    async def _get_history(*args: Any) -> dict[str, Any]:
+        start, end = args[-2:]
+        return {
+            "results": [
+                record for record in records if start <= record["started_at"] < end
+            ]
+        }
+
+    def _add(hass: Any, metadata: Any, statistics: list[Any]) -> None:
+        rows.setdefault(metadata["statistic_id"], []).extend(statistics)
+
+    importer = HistoryImporter(_Coordinator(), _Store())
+    with patch.object(history, "get_history", _get_history), patch.object(
+        history, "async_add_external_statistics", _add
+    ), patch.object(history, "time", lambda: START + 2 * HOUR), patch.object(
+        history, "HISTORY_BACKFILL", timedelta(hours=2)
+    ), patch.object(
+        history, "HISTORY_PAGE", timedelta(hours=1)
+    ), patch.object(
+        history, "HISTORY_PAGE_DELAY", 0
+    ):
+        asyncio.run(importer._async_import("VIN", CHARGES))
+    return rows, importer._store.saved
+
+
+def test_battery_hour_spanning_pages() -> None:
+    """Test that an hour with levels from two pages keeps the levels of both."""
+    rows, saved = _import(
+        [
+            {
+                "started_at": START + 3500,
+                "ended_at": START + 3900,
+                "energy_added": 2,
+                "starting_battery": 50,
+                "ending_battery": 40,
+            },
+            {
+                "started_at": START + 3700,
+                "ended_at": START + 4000,
+                "energy_added": 3,
+                "starting_battery": 60,
+                "ending_battery": 55,
+            },
+        ]
+    )
+
+    levels = rows["tessie:vin_charge_battery_level"]
+    last = {row["start"].timestamp(): row for row in levels}
+    first = last[START]
+    assert (first["mean"], first["min"], first["max"]) == (50, 50, 50)
+    second = last[START + HOUR]
+    assert second["mean"] == (40 + 60 + 55) / 3
+    assert (second["min"], second["max"]) == (40, 60)
+
+    sums = rows["tessie:vin_charge_energy"]
+    assert [row["sum"] for row in sums] == [2, 5]
+
+    cursor = saved["VIN"]["charges"]
+    assert cursor["from"] == START + 2 * HOUR
+    assert cursor["sum"] == 5
+    # Hours before the cursor can no longer change and are dropped
+    assert not cursor["levels"]
+
+
+def test_invalid_records_are_skipped() -> None:
+    """Test that records without valid times do not move the cursor."""
+    rows, saved = _import(
+        [
+            {"started_at": START + 10, "ended_at": "soon", "energy_added": 1},
+            {"started_at": START + 20, "ended_at": START + 30, "energy_added": 4},
+        ]
+    )
+    assert [row["sum"] for row in rows["tessie:vin_charge_energy"]] == [4]
+    assert saved["VIN"]["charges"]["last_end"] == START + 30
@@ -0,0 +1,87 @@
+"""Tests for the normalizers of raw vehicle values."""
+from __future__ import annotations
+
+from datetime import UTC, datetime
+import logging
+
+import pytest
+
+from custom_components.tessie.normalize import INVALID, enum, epoch, number, text
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        (42, 42),
+        (2.5, 2.5),
+        ("42", 42),
+        ("2.5", 2.5),
+        ("n/a", None),
+        (INVALID, None),
+        (None, None),
+        (True, None),
+        ([1], None),
+    ],
+)
+def test_number(value: object, expected: object) -> None:
+    """Test numbers reported as numbers or strings."""
+    assert number(value) == expected
+    assert type(number(value)) is type(expected)
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [("Model 3", "Model 3"), (3, "3"), (INVALID, None), (None, None)],
+)
+def test_text(value: object, expected: object) -> None:
+    """Test free form strings."""
+    assert text(value) == expected
+
+
+def test_enum(caplog: pytest.LogCaptureFixture) -> None:
+    """Test that unknown enum values pass through and are logged once."""
+    normalize = enum(["Charging", "Stopped"])
+
+    with caplog.at_level(logging.INFO):
+        assert normalize("Charging") == "Charging"
+        assert normalize(None) is None
+        assert normalize(INVALID) is None
+        assert not caplog.records
+
+        assert normalize("NoPower") == "NoPower"
+        assert normalize("NoPower") == "NoPower"
+        assert normalize(7) == "7"
+    assert [record.getMessage().split(",")[0] for record in caplog.records] == [
+        "Unknown value NoPower",
+        "Unknown value 7",
+    ]
+
+
+EPOCH = datetime(2023, 11, 14, 22, 13, 20, tzinfo=UTC)
+
+
+@pytest.mark.parametrize(
+    ("scale", "value", "expected"),
+    [
+        (1, 1700000000, EPOCH),
+        (1, 1700000000.0, EPOCH),
+        (1, "1700000000", EPOCH),
+        (1000, 1700000000000, EPOCH),
+        (1000, "1700000000000", EPOCH),
+        (1, "2023-11-14T22:13:20+00:00", EPOCH),
+        (1, EPOCH, EPOCH),
+        (1, 0, None),
+        (1, "0", None),
+        (1, -5, None),
+        (1, "soon", None),
+        (1, INVALID, None),
+        (1, None, None),
+        (1, [1700000000], None),
+    ],
+)
+def test_epoch(scale: float, value: object, expected: object) -> None:
+    """Test epochs reported as numbers or strings, and their persisted form."""
+    normalize = epoch(scale)
+    assert normalize(value) == expected
+    if expected is not None:
+        assert normalize(normalize(value).isoformat()) == expected
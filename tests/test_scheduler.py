@@ -0,0 +1,105 @@
+"""Tests for the per vehicle polling schedule."""
+from __future__ import annotations
+
+from typing import Any
+
+from custom_components.tessie.const import (
+    POLL_INTERVAL_ACTIVE,
+    POLL_INTERVAL_ASLEEP,
+    POLL_INTERVAL_ASLEEP_MAX,
+    POLL_INTERVAL_DEFAULT,
+    POLL_INTERVAL_MIN,
+    POLL_INTERVAL_PARKED,
+    POLL_INTERVAL_STREAMING,
+)
+from custom_components.tessie.models import VehicleSchema, VehicleState
+from custom_components.tessie.scheduler import (
+    DUE_SLACK,
+    SCHEDULER_KEY_PATHS,
+    VehiclePollScheduler,
+    poll_interval,
+)
+
+SCHEMA = VehicleSchema(SCHEDULER_KEY_PATHS)
+
+
+def _car(
+    state: str = "online",
+    charging: str | None = None,
+    shift: str | None = None,
+    locked: bool | None = None,
+    vin: str = "VIN",
+) -> VehicleState:
+    """Return a vehicle record in the given state."""
+    last_state: dict[str, Any] = {
+        "state": state,
+        "charge_state": {"charging_state": charging},
+        "drive_state": {"shift_state": shift},
+        "vehicle_state": {"locked": locked},
+    }
+    return SCHEMA.project({"vin": vin, "last_state": last_state})
+
+
+def test_poll_interval() -> None:
+    """Test the interval picked for each vehicle state."""
+    assert poll_interval(_car(charging="Charging")) == POLL_INTERVAL_ACTIVE
+    assert poll_interval(_car(shift="D")) == POLL_INTERVAL_ACTIVE
+    assert poll_interval(_car(shift="P", locked=True)) == POLL_INTERVAL_PARKED
+    assert poll_interval(_car(locked=False)) == POLL_INTERVAL_DEFAULT
+    assert poll_interval(_car(state="asleep")) == POLL_INTERVAL_ASLEEP
+    assert poll_interval(_car(state="offline"), 1) == POLL_INTERVAL_ASLEEP * 2
+    assert poll_interval(_car(state="asleep"), 10) == POLL_INTERVAL_ASLEEP_MAX
+
+
+def test_unknown_vehicles_are_due() -> None:
+    """Test that vehicles never scheduled are due right away."""
+    assert VehiclePollScheduler().due(["A", "B"], 100.0) == ["A", "B"]
+
+
+def test_due_with_slack() -> None:
+    """Test that vehicles falling due shortly are polled with the others."""
+    scheduler = VehiclePollScheduler()
+    scheduler.schedule("A", _car(charging="Charging"), 0.0)
+    scheduler.schedule("B", _car(locked=True), 0.0)
+    active = POLL_INTERVAL_ACTIVE.total_seconds()
+
+    assert scheduler.due(["A", "B"], active - DUE_SLACK - 1) == []
+    assert scheduler.due(["A", "B"], active - DUE_SLACK) == ["A"]
+    assert scheduler.next_refresh(0.0) == POLL_INTERVAL_ACTIVE
+
+
+def test_asleep_backoff_resets_on_wake() -> None:
+    """Test that a sleeping vehicle backs off until it wakes up."""
+    scheduler = VehiclePollScheduler()
+    now = 0.0
+    delays = []
+    for _ in range(6):
+        scheduler.schedule("A", _car(state="asleep"), now)
+        delays.append(scheduler.next_refresh(now))
+    assert delays[:4] == [POLL_INTERVAL_ASLEEP * 2**n for n in range(4)]
+    assert delays[-1] == POLL_INTERVAL_ASLEEP_MAX
+
+    scheduler.schedule("A", _car(charging="Charging"), now)
+    assert scheduler.next_refresh(now) == POLL_INTERVAL_ACTIVE
+    scheduler.schedule("A", _car(state="asleep"), now)
+    assert scheduler.next_refresh(now) == POLL_INTERVAL_ASLEEP
+
+
+def test_min_interval() -> None:
+    """Test that a minimum interval stretches the schedule of a vehicle."""
+    scheduler = VehiclePollScheduler()
+    scheduler.schedule("A", _car(charging="Charging"), 0.0, POLL_INTERVAL_STREAMING)
+    assert scheduler.next_refresh(0.0) == POLL_INTERVAL_STREAMING
+
+
+def test_next_refresh_bounds() -> None:
+    """Test the refresh delay without vehicles and for overdue vehicles."""
+    scheduler = VehiclePollScheduler()
+    assert scheduler.next_refresh(0.0) == POLL_INTERVAL_DEFAULT
+
+    scheduler.schedule("A", _car(charging="Charging"), 0.0)
+    assert scheduler.next_refresh(3600.0) == POLL_INTERVAL_MIN
+
+    scheduler.remove("A")
+    assert scheduler.due(["A"], 0.0) == ["A"]
+    assert scheduler.next_refresh(0.0) == POLL_INTERVAL_DEFAULT
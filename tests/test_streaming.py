@@ -0,0 +1,157 @@
+"""Tests for the telemetry stream, run against the mock Tessie API."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from typing import Any
+from unittest.mock import patch
+
+from benchmarks.mock_tessie import MockTessieApi
+from custom_components.tessie import streaming
+from custom_components.tessie.streaming import FIELDS, VehicleStream, parse_message
+
+BATTERY_LEVEL = FIELDS["BatteryLevel"][0]
+CHARGING_STATE = FIELDS["DetailedChargeState"][0]
+
+
+class _Governor:
+    """Governor stand-in letting every request through."""
+
+    async def async_acquire(self, priority: Any) -> None:
+        """Let the request through."""
+
+
+class _Coordinator:
+    """Coordinator stand-in recording what the stream does."""
+
+    def __init__(self, api: MockTessieApi) -> None:
+        self.session = api.session()
+        self.token = "token"
+        self.governor = _Governor()
+        self.streaming: list[bool] = []
+        self.updates: list[dict[Any, Any]] = []
+        self.refreshes = 0
+
+    def async_set_streaming(self, vin: str, connected: bool) -> None:
+        self.streaming.append(connected)
+
+    def async_apply_stream_update(self, vin: str, updates: dict[Any, Any]) -> None:
+        self.updates.append(updates)
+
+    async def async_request_refresh(self) -> None:
+        self.refreshes += 1
+
+
+class _Random:
+    """Random stand-in recording the backoff ranges and waiting briefly."""
+
+    def __init__(self) -> None:
+        self.ranges: list[tuple[float, float]] = []
+
+    def uniform(self, low: float, high: float) -> float:
+        self.ranges.append((low, high))
+        return 0.01
+
+
+async def _until(condition: Callable[[], bool], timeout: float = 5) -> None:
+    """Wait until the condition holds."""
+    async with asyncio.timeout(timeout):
+        while not condition():
+            await asyncio.sleep(0.01)
+
+
+def _run(
+    test: Callable[[MockTessieApi, _Coordinator, _Random], Awaitable[None]]
+) -> None:
+    """Run a test with a stream of the first vehicle of the mock."""
+
+    async def _async_run() -> None:
+        api = MockTessieApi(vehicles=1, stream_interval=0.01)
+        await api.start()
+        coordinator = _Coordinator(api)
+        backoff = _Random()
+        with patch.object(streaming, "random", backoff), patch.object(
+            streaming, "STREAM_RECONNECT_DELAY", 1.0
+        ), patch.object(streaming, "STREAM_RECONNECT_DELAY_MAX", 4.0):
+            task = asyncio.create_task(
+                VehicleStream(coordinator, next(iter(api.fleet))).async_run()
+            )
+            try:
+                await test(api, coordinator, backoff)
+            finally:
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+                await coordinator.session.close()
+                await api.stop()
+
+    asyncio.run(_async_run())
+
+
+def test_parse_message() -> None:
+    """Test that streamed fields are decoded onto their key paths."""
+    updates = parse_message(
+        {
+            "data": [
+                {"key": "BatteryLevel", "value": {"doubleValue": 80.6}},
+                {
+                    "key": "DetailedChargeState",
+                    "value": {"detailedChargeStateValue": "DetailedChargeStateEnable"},
+                },
+                {"key": "Locked", "value": {"invalid": True}},
+                {"key": "ChargeAmps", "value": {"intValue": "many"}},
+                {"key": "Unknown", "value": {"intValue": 1}},
+            ]
+        }
+    )
+    assert updates == {
+        BATTERY_LEVEL: 81,
+        CHARGING_STATE: "Starting",
+        FIELDS["Locked"][0]: None,
+    }
+
+
+def test_stream_reconnects() -> None:
+    """Test that a dropped stream catches up and reconnects at the base delay."""
+
+    async def _test(
+        api: MockTessieApi, coordinator: _Coordinator, backoff: _Random
+    ) -> None:
+        await _until(lambda: len(coordinator.updates) >= 2)
+        assert coordinator.streaming == [True]
+        assert BATTERY_LEVEL in coordinator.updates[0]
+        assert CHARGING_STATE in coordinator.updates[0]
+
+        await api.close_streams()
+        await _until(lambda: coordinator.streaming.count(True) == 2)
+        assert coordinator.streaming[:3] == [True, False, True]
+        assert coordinator.refreshes == 1
+        assert backoff.ranges == [(0.5, 1.0)]
+
+        received = len(coordinator.updates)
+        await _until(lambda: len(coordinator.updates) > received)
+
+    _run(_test)
+
+
+def test_stream_backoff() -> None:
+    """Test that failed connections back off up to the maximum delay."""
+
+    async def _test(
+        api: MockTessieApi, coordinator: _Coordinator, backoff: _Random
+    ) -> None:
+        api.error_rate = 1.0
+        await _until(lambda: len(backoff.ranges) >= 4)
+        assert backoff.ranges[:4] == [(0.5, 1.0), (1.0, 2.0), (2.0, 4.0), (2.0, 4.0)]
+        assert coordinator.streaming == []
+        assert coordinator.refreshes == 0
+
+        # Once connected, the next drop starts over from the base delay
+        api.error_rate = 0.0
+        await _until(lambda: coordinator.streaming == [True])
+        attempts = len(backoff.ranges)
+        await api.close_streams()
+        await _until(lambda: len(backoff.ranges) > attempts)
+        assert backoff.ranges[attempts] == (0.5, 1.0)
+        assert coordinator.refreshes == 1
+
+    _run(_test)